@@ -1,15 +1,13 @@
 import asyncio
 import inspect
 from copy import deepcopy
-from typing import Any, Callable, Coroutine, Literal, cast, overload
+from typing import Any, Callable, Coroutine, Literal, Sequence, cast, overload
 
 import discord
 from beartype import beartype
 from sqlalchemy import Delete as SQLDelete
-from sqlalchemy import ScalarResult
 from sqlalchemy import Select as SQLSelect
 from sqlalchemy import and_ as sql_and
-from sqlalchemy import or_ as sql_or
 from sqlalchemy.exc import StatementError as SQLError
 from sqlalchemy.orm import Session as SQLSession
 
@@ -18,12 +16,22 @@ from database import (
     DBBridge,
     DBMessageMap,
     DBWebhook,
-    engine,
+    delete_bridges_by_channels,
+    delete_message_maps_by_channels,
+    delete_webhooks_by_channels_or_webhooks,
+    session_factory,
     sql_insert_ignore_duplicate,
     sql_retry,
     sql_upsert,
+    uncache_message_maps,
+)
+from validations import (
+    ArgumentError,
+    TextChannelOrThread,
+    logger,
+    validate_channels,
+    validate_webhook,
 )
-from validations import ArgumentError, logger, validate_channels, validate_webhook
 
 
 class Bridge:
@@ -141,7 +149,7 @@ class Bridges:
         logger.info("Loading bridges from database...")
 
         if not session:
-            session = SQLSession(engine)
+            session = session_factory()
             close_after = True
         else:
             close_after = False
@@ -155,19 +163,81 @@ class Bridges:
         invalid_channel_ids: set[str] = set()
         invalid_webhook_ids: set[str] = set()
 
+        # Read both tables before making any requests to Discord, so the connection to the database isn't held while waiting on them
         select_all_webhooks: SQLSelect[tuple[DBWebhook]] = SQLSelect(DBWebhook)
-        webhook_query_result: ScalarResult[DBWebhook] = session.scalars(
+        webhook_query_result: Sequence[DBWebhook] = session.scalars(
             select_all_webhooks
+        ).all()
+        select_all_bridges: SQLSelect[tuple[DBBridge]] = SQLSelect(DBBridge)
+        bridge_query_result: Sequence[DBBridge] = session.scalars(
+            select_all_bridges
+        ).all()
+        if close_after:
+            session.commit()
+
+        # Resolve all the channels at once so the ones that need to be fetched are fetched concurrently
+        webhook_channel_ids = {
+            int(channel_webhook.channel) for channel_webhook in webhook_query_result
+        }
+        known_channels = await globals.get_channels_from_ids(
+            webhook_channel_ids | {int(bridge.source) for bridge in bridge_query_result}
+        )
+
+        # Fetch the webhooks of each parent channel once, concurrently, instead of fetching every webhook on its own
+        webhook_parent_channels: dict[
+            int, discord.TextChannel | discord.ForumChannel
+        ] = {}
+        for channel_id in webhook_channel_ids:
+            channel = known_channels[channel_id]
+            if isinstance(channel, discord.Thread):
+                parent_channel = channel.parent
+            elif isinstance(channel, discord.TextChannel):
+                parent_channel = channel
+            else:
+                continue
+
+            if parent_channel:
+                webhook_parent_channels[parent_channel.id] = parent_channel
+
+        webhook_fetch_semaphore = asyncio.Semaphore(
+            globals.max_concurrent_webhook_fetches
         )
+
+        async def fetch_parent_webhooks(
+            parent_channel: discord.TextChannel | discord.ForumChannel,
+        ) -> list[discord.Webhook]:
+            async with webhook_fetch_semaphore:
+                return await parent_channel.webhooks()
+
+        fetched_webhooks: dict[int, discord.Webhook] = {}
+        for parent_channel, parent_webhooks in zip(
+            webhook_parent_channels.values(),
+            await asyncio.gather(
+                *[
+                    fetch_parent_webhooks(parent_channel)
+                    for parent_channel in webhook_parent_channels.values()
+                ],
+                return_exceptions=True,
+            ),
+        ):
+            if isinstance(parent_webhooks, BaseException):
+                logger.debug(
+                    "Couldn't fetch webhooks of channel with ID %s when loading bridges from database: %s",
+                    parent_channel.id,
+                    parent_webhooks,
+                )
+                continue
+
+            for webhook in parent_webhooks:
+                fetched_webhooks[webhook.id] = webhook
+
         add_webhook_async: list[Coroutine[Any, Any, discord.Webhook]] = []
         for channel_webhook in webhook_query_result:
             channel_id = int(channel_webhook.channel)
             webhook_id = int(channel_webhook.webhook)
 
-            channel = await globals.get_channel_from_id(channel_id)
-            if not channel or not isinstance(
-                channel, (discord.TextChannel, discord.Thread)
-            ):
+            channel = known_channels[channel_id]
+            if not channel or not isinstance(channel, TextChannelOrThread):
                 # If I don't have access to the channel, delete bridges from and to it
                 logger.debug(
                     "Couldn't find channel with ID %s when loading webhooks from database.",
@@ -181,9 +251,7 @@ class Bridges:
                 invalid_channel_ids.add(channel_webhook.channel)
                 continue
 
-            try:
-                webhook = await globals.client.fetch_webhook(webhook_id)
-            except Exception:
+            if not (webhook := fetched_webhooks.get(webhook_id)):
                 # If I have access to the channel but not the webhook I remove that channel from targets
                 invalid_channel_ids.add(channel_webhook.channel)
                 invalid_webhook_ids.add(channel_webhook.webhook)
@@ -203,10 +271,6 @@ class Bridges:
         targets_with_sources: set[str] = set()
 
         async_create_bridges: list[Coroutine[Any, Any, Bridge]] = []
-        select_all_bridges: SQLSelect[tuple[DBBridge]] = SQLSelect(DBBridge)
-        bridge_query_result: ScalarResult[DBBridge] = session.scalars(
-            select_all_bridges
-        )
         for bridge in bridge_query_result:
             target_id_str = bridge.target
             if target_id_str in invalid_channel_ids:
@@ -237,7 +301,7 @@ class Bridges:
 
             source_id_str = bridge.source
             source_id = int(source_id_str)
-            source_channel = await globals.get_channel_from_id(source_id)
+            source_channel = known_channels[source_id]
             if not source_channel:
                 # If I don't have access to the source channel, delete bridges from and to it
                 logger.debug(
@@ -252,11 +316,20 @@ class Bridges:
                 # I have access to both the source and target channels and to the webhook
                 # so I can add this channel to my list of Bridges
                 targets_with_sources.add(target_id_str)
+                target_channel = known_channels.get(target_id)
                 try:
                     async_create_bridges.append(
                         self.create_bridge(
-                            source=source_id,
-                            target=target_id,
+                            source=(
+                                source_channel
+                                if isinstance(source_channel, TextChannelOrThread)
+                                else source_id
+                            ),
+                            target=(
+                                target_channel
+                                if isinstance(target_channel, TextChannelOrThread)
+                                else target_id
+                            ),
                             webhook=target_webhook,
                             update_db=False,
                         )
@@ -308,29 +381,24 @@ class Bridges:
             )
 
             if len(channel_ids_to_delete) > 0:
-                delete_invalid_bridges = SQLDelete(DBBridge).where(
-                    sql_or(
-                        DBBridge.source.in_(channel_ids_to_delete),
-                        DBBridge.target.in_(channel_ids_to_delete),
-                    )
+                channel_ids_to_delete_parameters = {
+                    "channel_ids": list(channel_ids_to_delete)
+                }
+                session.execute(
+                    delete_bridges_by_channels, channel_ids_to_delete_parameters
                 )
-                session.execute(delete_invalid_bridges)
-
-                delete_invalid_messages = SQLDelete(DBMessageMap).where(
-                    sql_or(
-                        DBMessageMap.source_channel.in_(channel_ids_to_delete),
-                        DBMessageMap.target_channel.in_(channel_ids_to_delete),
-                    )
-                )
-                session.execute(delete_invalid_messages)
-
-            delete_invalid_webhooks = SQLDelete(DBWebhook).where(
-                sql_or(
-                    DBWebhook.channel.in_(channel_ids_to_delete),
-                    DBWebhook.webhook.in_(invalid_webhook_ids),
+                session.execute(
+                    delete_message_maps_by_channels, channel_ids_to_delete_parameters
                 )
+                uncache_message_maps()
+
+            session.execute(
+                delete_webhooks_by_channels_or_webhooks,
+                {
+                    "channel_ids": list(channel_ids_to_delete),
+                    "webhook_ids": list(invalid_webhook_ids),
+                },
             )
-            session.execute(delete_invalid_webhooks)
 
         if close_after:
             session.commit()
@@ -427,7 +495,7 @@ class Bridges:
                         pass
         else:
             # Need to create a new bridge
-            bridge = await Bridge.create(source_id, target_id)
+            bridge = await Bridge.create(source_channel, target_channel)
 
             if not self._outbound_bridges.get(source_id):
                 self._outbound_bridges[source_id] = {}
@@ -479,7 +547,7 @@ class Bridges:
         try:
             if not session:
                 close_after = True
-                session = SQLSession(engine)
+                session = session_factory()
 
             target_id_str = str(target_id)
             insert_bridge_row = await sql_insert_ignore_duplicate(
@@ -497,8 +565,10 @@ class Bridges:
                 webhook=str(bridge_webhook.id),
             )
 
-            await sql_retry(lambda: session.execute(insert_bridge_row))
-            await sql_retry(lambda: session.execute(insert_webhook_row))
+            await sql_retry(lambda: session.execute(insert_bridge_row), session=session)
+            await sql_retry(
+                lambda: session.execute(insert_webhook_row), session=session
+            )
         except Exception as e:
             if close_after and session:
                 session.rollback()
@@ -688,7 +758,7 @@ class Bridges:
         close_after = False
         try:
             if not session:
-                session = SQLSession(engine)
+                session = session_factory()
                 close_after = True
 
             delete_demolished_bridges_and_messages: list[SQLDelete] = []
@@ -720,9 +790,14 @@ class Bridges:
                 delete_invalid_webhooks = None
 
             for delete_query in delete_demolished_bridges_and_messages:
-                await sql_retry(lambda: session.execute(delete_query))
+                await sql_retry(lambda: session.execute(delete_query), session=session)
+            if len(delete_demolished_bridges_and_messages) > 0:
+                # Cached message mappings may include some of the ones just deleted
+                uncache_message_maps()
             if delete_invalid_webhooks is not None:
-                await sql_retry(lambda: session.execute(delete_invalid_webhooks))
+                await sql_retry(
+                    lambda: session.execute(delete_invalid_webhooks), session=session
+                )
         except Exception:
             if close_after and session:
                 session.rollback()
@@ -789,6 +864,15 @@ class Bridges:
         logger.debug("Fetching outbound bridges from %s.", source)
         return self._outbound_bridges.get(globals.get_id_from_channel(source))
 
+    @beartype
+    def has_outbound_bridges(self, source_id: int) -> bool:
+        """Return whether a channel has any outbound bridges. This is a bare membership check, cheap enough to run on every event the bot receives before doing anything else.
+
+        #### Args:
+            - `source_id`: ID of the source channel.
+        """
+        return source_id in self._outbound_bridges
+
     @beartype
     def get_inbound_bridges(
         self, target: discord.TextChannel | discord.Thread | int
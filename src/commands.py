@@ -1,12 +1,10 @@
 import asyncio
 import re
-from typing import Any, AsyncIterator, Coroutine, Iterable, Literal
+from typing import Any, AsyncIterator, Coroutine, Iterable, Literal, Sequence
 
 import discord
 from beartype import beartype
 from sqlalchemy import Delete as SQLDelete
-from sqlalchemy import ScalarResult
-from sqlalchemy import Select as SQLSelect
 from sqlalchemy.exc import StatementError as SQLError
 from sqlalchemy.orm import Session as SQLSession
 
@@ -17,11 +15,17 @@ from database import (
     DBAppWhitelist,
     DBAutoBridgeThreadChannels,
     DBMessageMap,
-    engine,
+    select_message_maps_with_same_source,
+    session_factory,
     sql_retry,
 )
 from validations import ChannelTypeError, logger, validate_channels
 
+# Pattern matching a Discord link to a channel, a channel mention, or a bare channel ID
+channel_reference_pattern = re.compile(
+    r"(?:https://discord\.com/channels/\d+/(?P<link_id>\d+)/*|<#(?P<mention_id>\d+)>|#?(?P<id>\d+))$"
+)
+
 
 @globals.command_tree.command(
     name="help",
@@ -230,7 +234,7 @@ async def bridge(
 
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             create_bridges: list[Coroutine[Any, Any, Bridge]] = []
             if direction != "inbound":
                 create_bridges.append(
@@ -433,14 +437,15 @@ async def auto_bridge_threads(
 
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             if message_channel.id not in globals.auto_bridge_thread_channels:
                 await sql_retry(
                     lambda: session.add(
                         DBAutoBridgeThreadChannels(channel=str(message_channel.id))
-                    )
+                    ),
+                    session=session,
                 )
-                globals.auto_bridge_thread_channels.add(message_channel.id)
+                globals.add_auto_bridge_thread_channels([message_channel.id])
 
                 response = "✅ Threads will now be automatically created across bridges when they are created in this channel."
             else:
@@ -501,22 +506,12 @@ async def mention_to_channel(
     #### Returns:
         - The channel whose ID is given by `channel_id`.
     """
-    if link_or_mention.startswith("https://discord.com/channels"):
-        try:
-            while link_or_mention.endswith("/"):
-                link_or_mention = link_or_mention[:-1]
-
-            channel_id = int(link_or_mention.rsplit("/")[-1])
-        except ValueError:
-            return None
-    else:
-        try:
-            channel_id = int(
-                link_or_mention.replace("<", "").replace(">", "").replace("#", "")
-            )
-        except ValueError:
-            return None
+    if not (channel_match := channel_reference_pattern.match(link_or_mention.strip())):
+        return None
 
+    channel_id = int(
+        channel_match["link_id"] or channel_match["mention_id"] or channel_match["id"]
+    )
     return await globals.get_channel_from_id(channel_id)
 
 
@@ -587,7 +582,7 @@ async def demolish(interaction: discord.Interaction, target: str):
     await interaction.response.defer(thinking=True, ephemeral=True)
 
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             await bridges.demolish_bridges(
                 source_channel=message_channel,
                 target_channel=target_channel,
@@ -711,7 +706,7 @@ async def demolish_all(
     session = None
     exceptions: set[int] = set()
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             for channel_to_demolish_id, (
                 inbound_bridges,
                 outbound_bridges,
@@ -852,9 +847,11 @@ async def whitelist(interaction: discord.Interaction, apps: str):
         await interaction.response.send_message("❌ App IDs not valid.", ephemeral=True)
         return
 
-    channel_whitelist: set[int] | None = globals.per_channel_whitelist.get(channel.id)
+    channel_whitelist: frozenset[int] | None = globals.per_channel_whitelist.get(
+        channel.id
+    )
     if not channel_whitelist:
-        channel_whitelist = set()
+        channel_whitelist = frozenset()
 
     outbound_bridges = bridges.get_outbound_bridges(channel)
     if not outbound_bridges and not any(
@@ -889,21 +886,16 @@ async def whitelist(interaction: discord.Interaction, apps: str):
     response: list[str] = []
     try:
         channel_id_str = str(channel.id)
-        with SQLSession(engine) as session:
-            run_queries: list[Coroutine[Any, Any, Any]] = []
+        with session_factory() as session:
             if len(apps_to_add) > 0:
-                run_queries.append(
-                    sql_retry(
-                        lambda: session.add_all(
-                            [
-                                DBAppWhitelist(
-                                    channel=channel_id_str,
-                                    application=str(app_id),
-                                )
-                                for app_id in apps_to_add
-                            ]
+                session.add_all(
+                    [
+                        DBAppWhitelist(
+                            channel=channel_id_str,
+                            application=str(app_id),
                         )
-                    )
+                        for app_id in apps_to_add
+                    ]
                 )
 
                 apps_to_add_str = ", ".join([f"<@{app_id}>" for app_id in apps_to_add])
@@ -918,7 +910,7 @@ async def whitelist(interaction: discord.Interaction, apps: str):
                         [str(app_id) for app_id in apps_to_remove]
                     ),
                 )
-                run_queries.append(sql_retry(lambda: session.execute(remove_apps)))
+                await sql_retry(lambda: session.execute(remove_apps), session=session)
 
                 apps_to_remove_str = ", ".join(
                     [f"<@{app_id}>" for app_id in apps_to_remove]
@@ -927,17 +919,9 @@ async def whitelist(interaction: discord.Interaction, apps: str):
                     f"✅ Removed the following app(s) from this channel's whitelist: {apps_to_remove_str}."
                 )
 
-            await asyncio.gather(*run_queries)
             session.commit()
 
-            if not globals.per_channel_whitelist.get(channel.id):
-                globals.per_channel_whitelist[channel.id] = set()
-            globals.per_channel_whitelist[channel.id] = (
-                globals.per_channel_whitelist[channel.id].union(apps_to_add)
-                - apps_to_remove
-            )
-            if len(globals.per_channel_whitelist[channel.id]) == 0:
-                del globals.per_channel_whitelist[channel.id]
+            globals.update_channel_whitelist(channel.id, apps_to_add, apps_to_remove)
     except Exception as e:
         if session:
             session.rollback()
@@ -998,7 +982,7 @@ async def map_emoji(
         interaction.id,
     )
 
-    if not globals.settings.get("emoji_server_id"):
+    if not globals.emoji_server_id:
         await interaction.response.send_message(
             "❌ Bot doesn't have an emoji server registered.", ephemeral=True
         )
@@ -1035,7 +1019,7 @@ async def map_emoji(
 
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             image_hash = await emoji_hash_map.map.get_hash(
                 emoji=internal_emoji, session=session
             )
@@ -1273,33 +1257,29 @@ async def bridge_thread_helper(
     # The IDs of threads are the same as that of their originating messages so we should try to create threads from the same messages
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             matching_starting_messages: dict[int, int] = {}
             try:
                 # I don't need to store it I just need to know whether it exists
                 await thread_parent.fetch_message(thread_to_bridge.id)
-                select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                    DBMessageMap
-                ).where(DBMessageMap.target_message == str(thread_to_bridge.id))
-                source_starting_message: DBMessageMap | None = await sql_retry(
-                    lambda: session.scalars(select_message_map).first()
-                )
-                if isinstance(source_starting_message, DBMessageMap):
-                    # The message that's starting this thread is bridged
-                    source_channel_id = int(source_starting_message.source_channel)
-                    source_message_id = int(source_starting_message.source_message)
-                    matching_starting_messages[source_channel_id] = source_message_id
-                else:
-                    source_channel_id = thread_parent.id
-                    source_message_id = thread_to_bridge.id
-
-                select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                    DBMessageMap
-                ).where(DBMessageMap.source_message == str(source_message_id))
-                target_starting_messages: ScalarResult[DBMessageMap] = await sql_retry(
-                    lambda: session.scalars(select_message_map)
+                # Find the starting message's source, if it was bridged, and all other bridged versions of it in one go
+                thread_to_bridge_id_str = str(thread_to_bridge.id)
+                target_starting_messages: Sequence[DBMessageMap] = await sql_retry(
+                    lambda: session.scalars(
+                        select_message_maps_with_same_source,
+                        {"message_id": thread_to_bridge_id_str},
+                    ).all(),
+                    session=session,
                 )
                 for target_starting_message in target_starting_messages:
+                    if (
+                        target_starting_message.target_message
+                        == thread_to_bridge_id_str
+                    ):
+                        # The message that's starting this thread is bridged
+                        matching_starting_messages[
+                            int(target_starting_message.source_channel)
+                        ] = int(target_starting_message.source_message)
                     matching_starting_messages[
                         int(target_starting_message.target_channel)
                     ] = int(target_starting_message.target_message)
@@ -1453,7 +1433,7 @@ async def stop_auto_bridging_threads_helper(
     close_after = False
     try:
         if not session:
-            session = SQLSession(engine)
+            session = session_factory()
             close_after = True
 
         await sql_retry(
@@ -1463,10 +1443,11 @@ async def stop_auto_bridging_threads_helper(
                         [str(id) for id in channel_ids_to_remove]
                     )
                 )
-            )
+            ),
+            session=session,
         )
 
-        globals.auto_bridge_thread_channels -= channel_ids_to_remove
+        globals.remove_auto_bridge_thread_channels(channel_ids_to_remove)
     except Exception:
         if close_after and session:
             session.rollback()
@@ -1600,7 +1581,7 @@ async def list_reactions(interaction: discord.Interaction, message: discord.Mess
         if mapped_emoji := emoji_hash_map.map.get_accessible_emoji(emoji.id):
             # If there is an emoji I have access to that matches this one, return it
             return str(mapped_emoji)
-        elif not globals.emoji_server:
+        elif not await globals.get_emoji_server():
             # I don't have an emoji server to copy the emoji into so I'll just return its string
             return str(emoji)
 
@@ -1646,15 +1627,23 @@ async def list_reactions(interaction: discord.Interaction, message: discord.Mess
     session = None
     at_least_one_inaccessible_bridge = False
     try:
-        with SQLSession(engine) as session:
-            # We need to see whether this message is a bridged message and, if so, find its source
-            select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                DBMessageMap
-            ).where(
-                DBMessageMap.target_message == str(message.id),
+        with session_factory() as session:
+            # We need to see whether this message is a bridged message and, if so, find its source, along with every message bridged from that source
+            message_id_str = str(message.id)
+            bridged_messages: Sequence[DBMessageMap] = await sql_retry(
+                lambda: session.scalars(
+                    select_message_maps_with_same_source,
+                    {"message_id": message_id_str},
+                ).all(),
+                session=session,
             )
-            source_message_map: DBMessageMap | None = await sql_retry(
-                lambda: session.scalars(select_message_map).first()
+            source_message_map = next(
+                (
+                    message_row
+                    for message_row in bridged_messages
+                    if message_row.target_message == message_id_str
+                ),
+                None,
             )
             if isinstance(source_message_map, DBMessageMap):
                 # This message was bridged, so find the original one and then find any other bridged messages from it
@@ -1684,12 +1673,6 @@ async def list_reactions(interaction: discord.Interaction, message: discord.Mess
             # Then we find all messages bridged from the source
             outbound_bridges = bridges.get_outbound_bridges(source_channel_id)
             if outbound_bridges:
-                select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                    DBMessageMap
-                ).where(DBMessageMap.source_message == str(source_message_id))
-                bridged_messages: ScalarResult[DBMessageMap] = await sql_retry(
-                    lambda: session.scalars(select_message_map)
-                )
                 for message_row in bridged_messages:
                     target_channel_id = int(message_row.target_channel)
                     if (
@@ -1,19 +1,27 @@
-from typing import Any, Callable, Iterable
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Sequence
+from weakref import WeakKeyDictionary
 
 from beartype import beartype
 from sqlalchemy import Boolean
+from sqlalchemy import Delete as SQLDelete
+from sqlalchemy import Insert as SQLInsert
 from sqlalchemy import Select as SQLSelect
 from sqlalchemy import String, UniqueConstraint
 from sqlalchemy import Update as SQLUpdate
-from sqlalchemy import UpdateBase, create_engine
+from sqlalchemy import UpdateBase, bindparam, create_engine, event
 from sqlalchemy import insert as other_db_insert
+from sqlalchemy import or_ as sql_or
 from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import StatementError as SQLError
 from sqlalchemy.orm import DeclarativeBase, Mapped
 from sqlalchemy.orm import Session as SQLSession
-from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import mapped_column, sessionmaker
 
-from globals import T, run_retries, settings
+from globals import T, db_url, run_retries
 from validations import logger
 
 
@@ -69,9 +77,9 @@ class DBMessageMap(DBBase):
 
     #### Columns
     - `id (INT)`: The id number of a mapping, has `PRIMARY KEY` and `AUTO_INCREMENT`.
-    - `source_message (VARCHAR(32))`: The ID of the message in the original channel.
+    - `source_message (VARCHAR(32))`: The ID of the message in the original channel, has `INDEX`.
     - `source_channel (VARCHAR(32))`: The ID of the channel or thread that message was sent to.
-    - `target_message (VARCHAR(32))`: The ID of the message generated by the bot across a bridge.
+    - `target_message (VARCHAR(32))`: The ID of the message generated by the bot across a bridge, has `INDEX`.
     - `forward_header_message (VARCHAR(32))`: The ID of a message that's the header for a bridged forwarded message.
     - `target_channel (VARCHAR(32))`: The ID of the channel or thread the bridged message was bridged to.
     - `webhook (VARCHAR(32))`: The ID of the webhook that posted the message.
@@ -80,9 +88,9 @@ class DBMessageMap(DBBase):
     __tablename__ = "message_mappings"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    source_message: Mapped[str] = mapped_column(String(32), nullable=False)
+    source_message: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     source_channel: Mapped[str] = mapped_column(String(32), nullable=False)
-    target_message: Mapped[str] = mapped_column(String(32), nullable=False)
+    target_message: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     forward_header_message: Mapped[str] = mapped_column(String(32), nullable=True)
     target_channel: Mapped[str] = mapped_column(String(32), nullable=False)
     webhook: Mapped[str] = mapped_column(String(32), nullable=True)
@@ -244,7 +252,7 @@ async def sql_upsert(
         # I'll do a manual update in this case
         session = None
         try:
-            with SQLSession(engine) as session:
+            with session_factory() as session:
                 index_values = [
                     getattr(table, idx) == insert_values[idx] for idx in indices
                 ]
@@ -256,7 +264,7 @@ async def sql_upsert(
                     )
                     return session.execute(select_table).first()
 
-                if await sql_retry(lambda: select_existing(session)):
+                if await sql_retry(lambda: select_existing(session), session=session):
                     # Values with those keys do exist, so I update
                     upsert = (
                         SQLUpdate(table).where(*index_values).values(**update_values)
@@ -312,7 +320,7 @@ async def sql_insert_ignore_duplicate(
         # I'll do a manual update in this case
         session = None
         try:
-            with SQLSession(engine) as session:
+            with session_factory() as session:
                 index_values = [
                     getattr(table, idx) == insert_values[idx] for idx in indices
                 ]
@@ -324,7 +332,7 @@ async def sql_insert_ignore_duplicate(
                     )
                     return session.execute(select_table).first()
 
-                if await sql_retry(lambda: select_existing(session)):
+                if await sql_retry(lambda: select_existing(session), session=session):
                     # Values with those keys do exist, so I do nothing
                     random_index = indices.pop()
                     insert_unknown = SQLUpdate(table).values(
@@ -341,34 +349,422 @@ async def sql_insert_ignore_duplicate(
             raise
 
 
+# Threads that run the functions passed to sql_retry(), so that waiting on the database doesn't block the event loop; sized to match the engine's connection pool
+database_executor = ThreadPoolExecutor(max_workers=30, thread_name_prefix="database")
+
+# Locks making sure each session only runs one function in the database threads at a time, since a session can't be used from several threads at once
+session_locks: WeakKeyDictionary[SQLSession, asyncio.Lock] = WeakKeyDictionary()
+
+
+@beartype
+def get_session_lock(session: SQLSession) -> asyncio.Lock:
+    """Return the lock guarding a session's use from the database threads, creating it if necessary.
+
+    #### Args:
+        - `session`: The session.
+    """
+    if (lock := session_locks.get(session)) is None:
+        lock = session_locks[session] = asyncio.Lock()
+    return lock
+
+
 @beartype
 async def sql_retry(
     fun: Callable[..., T],
     num_retries: int = 5,
     time_to_wait: float | int = 10,
+    *,
+    session: SQLSession,
 ) -> T:
-    """Run an SQL function and retry it every time an SQLError occurs up to a certain maximum number of tries. If it succeeds, return its result; otherwise, raise the error.
+    """Run an SQL function in one of the database threads and retry it every time an SQLError occurs up to a certain maximum number of tries. If it succeeds, return its result; otherwise, raise the error.
 
     #### Args:
         - `fun`: The function to run.
         - `num_retries`: The number of times to try the function again.
         - `time_to_wait`: How long to wait between retries.
+        - `session`: The session `fun` uses. Only one function using it is run at a time, even when several are awaited concurrently.
 
     #### Returns:
         - `T`: The result of calling `fun()`.
     """
-    return await run_retries(fun, num_retries, time_to_wait, SQLError)
+    loop = asyncio.get_running_loop()
+    session_lock = get_session_lock(session)
+
+    async def run_in_database_thread() -> T:
+        async with session_lock:
+            return await loop.run_in_executor(database_executor, fun)
+
+    return await run_retries(
+        run_in_database_thread,
+        num_retries,
+        time_to_wait,
+        SQLError,
+    )
+
+
+@beartype
+async def sql_commit(session: SQLSession):
+    """Commit a session in one of the database threads, so that flushing its pending changes and waiting on the database don't block the event loop. Unlike `sql_retry()`, a failed commit is not retried, since the session has to be rolled back first.
+
+    #### Args:
+        - `session`: The session to commit.
+    """
+    async with get_session_lock(session):
+        await asyncio.get_running_loop().run_in_executor(
+            database_executor, session.commit
+        )
+
+
+# Mappings of recently bridged messages, in least-recently-used order, mapping the ID of each source message to the mappings of its bridged versions
+message_map_cache: OrderedDict[str, tuple[DBMessageMap, ...]] = OrderedDict()
+max_cached_message_maps = 20000
+
+# The ID of the source message of each bridged message in message_map_cache
+message_map_cache_sources: dict[str, str] = {}
+
+# Messages that were looked up as sources and found to have no bridged versions, in least-recently-used order, so that repeated lookups (e.g. edits to messages sent before their channel was bridged) don't go back to the database
+unbridged_message_cache: OrderedDict[str, None] = OrderedDict()
+max_cached_unbridged_messages = 20000
+
+# Messages whose mappings are waiting to be deleted, mapped to the futures that will receive the mappings of their bridged versions, and the tasks that will delete them
+pending_message_map_deletes: dict[str, asyncio.Future[tuple[DBMessageMap, ...]]] = {}
+message_map_delete_tasks: set[asyncio.Task[None]] = set()
+message_map_delete_window = 0.1
+max_pending_message_map_deletes = 500
+
+
+@beartype
+def cache_message_maps(source_message_id: str, message_maps: Iterable[DBMessageMap]):
+    """Store the mappings of a source message's bridged versions in the message map cache, evicting the least recently used entries if it grows too big.
+
+    #### Args:
+        - `source_message_id`: The ID of the source message.
+        - `message_maps`: The mappings of all of its bridged versions.
+    """
+    uncache_message_maps(source_message_id)
+    unbridged_message_cache.pop(source_message_id, None)
+
+    message_maps = tuple(message_maps)
+    message_map_cache[source_message_id] = message_maps
+    for message_map in message_maps:
+        message_map_cache_sources[message_map.target_message] = source_message_id
+
+    while len(message_map_cache) > max_cached_message_maps:
+        _, evicted_message_maps = message_map_cache.popitem(last=False)
+        for message_map in evicted_message_maps:
+            message_map_cache_sources.pop(message_map.target_message, None)
+
+
+@beartype
+def uncache_message_maps(message_id: str | None = None):
+    """Remove a message's mappings from the message map cache. If the message is a bridged version of another message, its source's entry is removed.
+
+    #### Args:
+        - `message_id`: The ID of the source message or of one of its bridged versions. Defaults to None, in which case the cache is emptied.
+    """
+    if message_id is None:
+        message_map_cache.clear()
+        message_map_cache_sources.clear()
+        unbridged_message_cache.clear()
+        return
+
+    unbridged_message_cache.pop(message_id, None)
+    source_message_id = message_map_cache_sources.pop(message_id, message_id)
+    for message_map in message_map_cache.pop(source_message_id, ()):
+        message_map_cache_sources.pop(message_map.target_message, None)
+
+
+@beartype
+def get_cached_message_maps_with_same_source(
+    message_id: str,
+) -> tuple[DBMessageMap, ...] | None:
+    """Return the mappings of all bridged versions of the same source as a message from the message map cache, whether the message is the source or one of its bridged versions, or None if they're not in the cache.
+
+    #### Args:
+        - `message_id`: The ID of the message.
+    """
+    source_message_id = message_map_cache_sources.get(message_id, message_id)
+    if (message_maps := message_map_cache.get(source_message_id)) is not None:
+        message_map_cache.move_to_end(source_message_id)
+
+    return message_maps
+
+
+@beartype
+async def get_message_maps_from_source(
+    session: SQLSession, source_message_id: str
+) -> tuple[DBMessageMap, ...]:
+    """Return the mappings of all bridged versions of a source message, from the message map cache if they're in it and from the database otherwise. Messages found to have no bridged versions are remembered, so looking them up again doesn't go back to the database.
+
+    #### Args:
+        - `session`: A connection to the database.
+        - `source_message_id`: The ID of the source message.
+    """
+    if (message_maps := message_map_cache.get(source_message_id)) is not None:
+        message_map_cache.move_to_end(source_message_id)
+        return message_maps
+
+    if source_message_id in unbridged_message_cache:
+        unbridged_message_cache.move_to_end(source_message_id)
+        return ()
+
+    message_maps = tuple(
+        await sql_retry(
+            lambda: session.scalars(
+                select_message_map_by_source, {"message_id": source_message_id}
+            ).all(),
+            session=session,
+        )
+    )
+    if len(message_maps) > 0:
+        cache_message_maps(source_message_id, message_maps)
+    else:
+        unbridged_message_cache[source_message_id] = None
+        if len(unbridged_message_cache) > max_cached_unbridged_messages:
+            unbridged_message_cache.popitem(last=False)
 
+    return message_maps
+
+
+@beartype
+async def pop_message_maps_from_source(message_id: str) -> tuple[DBMessageMap, ...]:
+    """Delete every mapping involving a message, whether it's the source of the mapping or its target, and return the mappings of all bridged versions of that message.
+
+    Deletions requested within a short window of each other, such as when a channel is being cleaned up, are batched into a single statement and committed together.
+
+    #### Args:
+        - `message_id`: The ID of the message.
+    """
+    future = pending_message_map_deletes.get(message_id)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        pending_message_map_deletes[message_id] = future
+
+    if len(pending_message_map_deletes) >= max_pending_message_map_deletes:
+        # The batch is full, so delete it straight away
+        delete_task = asyncio.create_task(
+            delete_message_maps(dict(pending_message_map_deletes))
+        )
+        pending_message_map_deletes.clear()
+    elif len(pending_message_map_deletes) == 1:
+        delete_task = asyncio.create_task(flush_message_map_deletes())
+    else:
+        delete_task = None
+
+    if delete_task:
+        message_map_delete_tasks.add(delete_task)
+        delete_task.add_done_callback(message_map_delete_tasks.discard)
+
+    return await future
+
+
+@beartype
+async def flush_message_map_deletes():
+    """Delete the mappings of all messages whose deletion was requested from `pop_message_maps_from_source()` in the last few milliseconds."""
+    await asyncio.sleep(message_map_delete_window)
+    pending_deletes = dict(pending_message_map_deletes)
+    pending_message_map_deletes.clear()
+    await delete_message_maps(pending_deletes)
+
+
+@beartype
+async def delete_message_maps(
+    pending_deletes: dict[str, asyncio.Future[tuple[DBMessageMap, ...]]],
+):
+    """Delete every mapping involving a batch of messages in a single statement and resolve each message's future with the mappings of its bridged versions.
+
+    When the database supports `DELETE ... RETURNING`, the mappings are read and deleted in that same statement. If the batch fails, each message is deleted on its own so that only the futures of the messages that still fail get the exception.
+
+    #### Args:
+        - `pending_deletes`: The futures waiting on each message's mappings, identified by message ID.
+    """
+    if len(pending_deletes) == 0:
+        return
+
+    message_ids = list(pending_deletes.keys())
+    message_ids_parameters = {"message_ids": message_ids}
+    try:
+        with session_factory() as session:
+            if engine.dialect.delete_returning:
+                deleted_maps: Sequence[DBMessageMap] = await sql_retry(
+                    lambda: session.scalars(
+                        delete_message_maps_by_messages_returning,
+                        message_ids_parameters,
+                    ).all(),
+                    session=session,
+                )
+            else:
+                deleted_maps = [
+                    message_map
+                    for message_id in message_ids
+                    for message_map in message_map_cache.get(message_id, ())
+                ]
+                if uncached_message_ids := [
+                    message_id
+                    for message_id in message_ids
+                    if message_id not in message_map_cache
+                ]:
+                    deleted_maps.extend(
+                        await sql_retry(
+                            lambda: session.scalars(
+                                select_message_maps_by_sources,
+                                {"message_ids": uncached_message_ids},
+                            ).all(),
+                            session=session,
+                        )
+                    )
+                await sql_retry(
+                    lambda: session.execute(
+                        delete_message_maps_by_messages, message_ids_parameters
+                    ),
+                    session=session,
+                )
+            await sql_commit(session)
+    except Exception as e:
+        if len(pending_deletes) > 1:
+            # Don't let one message fail the whole batch; delete each message's mappings on their own instead
+            logger.warning(
+                "An error occurred while deleting the mappings of %s messages at once, deleting them one by one instead: %s",
+                len(pending_deletes),
+                e,
+            )
+            for message_id, future in pending_deletes.items():
+                await delete_message_maps({message_id: future})
+            return
+
+        for future in pending_deletes.values():
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    message_maps_by_source: dict[str, list[DBMessageMap]] = {}
+    for message_map in deleted_maps:
+        message_maps_by_source.setdefault(message_map.source_message, []).append(
+            message_map
+        )
+
+    for message_id, future in pending_deletes.items():
+        uncache_message_maps(message_id)
+        if not future.done():
+            future.set_result(tuple(message_maps_by_source.get(message_id, ())))
+
+
+# Statements looking up message mappings, built once so their compiled forms are reused; the message ID is bound as "message_id" when they're executed
+select_message_map_by_source: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
+    DBMessageMap
+).where(DBMessageMap.source_message == bindparam("message_id"))
+# This one finds every mapping from the same source as the message, whether the message is the source or one of its bridged versions
+select_message_maps_with_same_source: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
+    DBMessageMap
+).where(
+    sql_or(
+        DBMessageMap.source_message == bindparam("message_id"),
+        DBMessageMap.source_message.in_(
+            SQLSelect(DBMessageMap.source_message)
+            .where(DBMessageMap.target_message == bindparam("message_id"))
+            .scalar_subquery()
+        ),
+    )
+)
+
+# Statements looking up and deleting the mappings of a batch of messages, with the message IDs bound as a "message_ids" list when they're executed
+select_message_maps_by_sources: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
+    DBMessageMap
+).where(DBMessageMap.source_message.in_(bindparam("message_ids", expanding=True)))
+delete_message_maps_by_messages: SQLDelete = (
+    SQLDelete(DBMessageMap)
+    .where(
+        sql_or(
+            DBMessageMap.source_message.in_(bindparam("message_ids", expanding=True)),
+            DBMessageMap.target_message.in_(bindparam("message_ids", expanding=True)),
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
+delete_message_maps_by_messages_returning: SQLDelete = (
+    delete_message_maps_by_messages.returning(DBMessageMap)
+)
+
+# This one finds the bridged versions of a reaction, with the source message and emoji IDs bound as "message_id" and "emoji_id" when it's executed
+select_reaction_maps_by_source: SQLSelect[tuple[DBReactionMap]] = SQLSelect(
+    DBReactionMap
+).where(
+    DBReactionMap.source_message == bindparam("message_id"),
+    DBReactionMap.source_emoji == bindparam("emoji_id"),
+)
+
+# This one inserts message mappings straight into their table, bypassing the ORM, with the rows passed as a list of dictionaries when it's executed
+insert_message_maps: SQLInsert = SQLInsert(DBMessageMap.__table__)
+
+# Statements deleting everything associated with channels or webhooks that are no longer valid, with the IDs bound as "channel_ids" and "webhook_ids" lists when they're executed
+delete_bridges_by_channels: SQLDelete = (
+    SQLDelete(DBBridge)
+    .where(
+        sql_or(
+            DBBridge.source.in_(bindparam("channel_ids", expanding=True)),
+            DBBridge.target.in_(bindparam("channel_ids", expanding=True)),
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
+delete_message_maps_by_channels: SQLDelete = (
+    SQLDelete(DBMessageMap)
+    .where(
+        sql_or(
+            DBMessageMap.source_channel.in_(bindparam("channel_ids", expanding=True)),
+            DBMessageMap.target_channel.in_(bindparam("channel_ids", expanding=True)),
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
+delete_webhooks_by_channels_or_webhooks: SQLDelete = (
+    SQLDelete(DBWebhook)
+    .where(
+        sql_or(
+            DBWebhook.channel.in_(bindparam("channel_ids", expanding=True)),
+            DBWebhook.webhook.in_(bindparam("webhook_ids", expanding=True)),
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
 
 # Create the engine connecting to the database
 logger.info("Creating engine to connect to database...")
+# Whether the database is SQLite, which is checked before the engine exists to configure it
+db_is_sqlite = make_url(db_url).get_backend_name() == "sqlite"
+# SQLite connections are local files, so there is no connection pool worth sizing for them
+pool_arguments: dict[str, Any] = (
+    {} if db_is_sqlite else {"pool_size": 20, "max_overflow": 10}
+)
 engine = create_engine(
-    f"{settings['db_dialect']}+{settings['db_driver']}://{settings['db_user']}:{settings['db_pwd']}@{settings['db_host']}:{settings['db_port']}/{settings['db_name']}",
+    db_url,
+    query_cache_size=1200,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_recycle=1800,
+    **pool_arguments,
 )
 logger.info("Created.")
 
+if db_is_sqlite:
+
+    @event.listens_for(engine, "connect")
+    @beartype
+    def set_sqlite_pragmas(dbapi_connection: Any, _: Any):
+        """Switch each new SQLite connection to write-ahead logging, which only syncs to disk at checkpoints rather than on every commit.
+
+        #### Args:
+            - `dbapi_connection`: The DBAPI connection that was just opened.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+# Factory for sessions connected to the database, which check connections out of the engine's pool; objects loaded through them are not expired on commit, so reading them afterwards doesn't go back to the database
+session_factory = sessionmaker(engine, expire_on_commit=False)
+
 # Create all tables represented by the above classes, if they haven't already been created
 logger.info("Ensuring all necessary tables exist...")
 try:
@@ -377,3 +773,14 @@ except Exception as e:
     logger.error("An error occurred while trying to create necessary tables: %s", e)
     raise
 logger.info("All necessary tables are available.")
+
+# create_all() skips tables that already exist, so indexes added to them since they were created have to be created separately
+logger.info("Ensuring all necessary indexes exist...")
+try:
+    for table in DBBase.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+except Exception as e:
+    logger.error("An error occurred while trying to create necessary indexes: %s", e)
+    raise
+logger.info("All necessary indexes are available.")
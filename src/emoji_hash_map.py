@@ -1,5 +1,5 @@
 import asyncio
-import random
+from collections import OrderedDict
 from typing import Any, Coroutine, Literal, Sequence, overload
 
 import discord
@@ -14,7 +14,7 @@ from sqlalchemy.exc import StatementError as SQLError
 from sqlalchemy.orm import Session as SQLSession
 
 import globals
-from database import DBEmoji, engine, sql_retry, sql_upsert
+from database import DBEmoji, session_factory, sql_retry, sql_upsert
 from validations import ArgumentError, logger
 
 
@@ -36,11 +36,12 @@ class EmojiHashMap:
         self._hash_to_emoji: dict[str, set[int]] = {}
         self._hash_to_available_emoji: dict[str, set[int]] = {}
         self._hash_to_internal_emoji: dict[str, int] = {}
+        self._internal_emoji_usage: OrderedDict[int, None] = OrderedDict()
 
         close_after = False
         try:
             if not session:
-                session = SQLSession(engine)
+                session = session_factory()
                 close_after = True
 
             select_hashed_emoji: SQLSelect[tuple[DBEmoji]] = SQLSelect(DBEmoji)
@@ -132,9 +133,7 @@ class EmojiHashMap:
 
         if not is_internal and server_id:
             server_id = int(server_id)
-            if (
-                emoji_server_id := globals.settings.get("emoji_server_id")
-            ) and server_id == int(emoji_server_id):
+            if server_id == globals.emoji_server_id:
                 is_internal = True
                 accessible = True
             elif globals.client.get_guild(server_id):
@@ -162,6 +161,8 @@ class EmojiHashMap:
 
         if is_internal:
             self._hash_to_internal_emoji[image_hash] = emoji_id
+            self._internal_emoji_usage[emoji_id] = None
+            self._internal_emoji_usage.move_to_end(emoji_id)
 
         logger.debug("Emoji with ID %s added to map.", emoji_id)
         return (emoji_id, image_hash)
@@ -222,7 +223,7 @@ class EmojiHashMap:
         close_after = False
         try:
             if not session:
-                session = SQLSession(engine)
+                session = session_factory()
                 close_after = True
 
             upsert_emoji = await self.upsert_emoji(
@@ -233,7 +234,7 @@ class EmojiHashMap:
                 image_hash=image_hash,
                 accessible=accessible,
             )
-            await sql_retry(lambda: session.execute(upsert_emoji))
+            await sql_retry(lambda: session.execute(upsert_emoji), session=session)
         except Exception:
             if close_after and session:
                 session.rollback()
@@ -308,8 +309,8 @@ class EmojiHashMap:
                 image_hash = globals.hash_image(image)
 
         if is_internal:
-            assert (emoji_server_id_raw := globals.settings.get("emoji_server_id"))
-            emoji_server_id = int(emoji_server_id_raw)
+            emoji_server_id = globals.emoji_server_id
+            assert emoji_server_id
 
         emoji_id, image_hash = self._add_emoji_to_map(
             emoji_id,
@@ -323,7 +324,7 @@ class EmojiHashMap:
             close_after = False
             try:
                 if not session:
-                    session = SQLSession(engine)
+                    session = session_factory()
                     close_after = True
 
                 await self._add_emoji_to_database(
@@ -424,6 +425,7 @@ class EmojiHashMap:
 
         if self._hash_to_internal_emoji.get(image_hash):
             del self._hash_to_internal_emoji[image_hash]
+        self._internal_emoji_usage.pop(emoji_id, None)
 
         logger.debug("Emoji with ID %s deleted from map.", emoji_id)
 
@@ -432,13 +434,14 @@ class EmojiHashMap:
             close_after = False
             try:
                 if not session:
-                    session = SQLSession(engine)
+                    session = session_factory()
                     close_after = True
 
                 await sql_retry(
                     lambda: session.execute(
                         SQLDelete(DBEmoji).where(DBEmoji.id == str(emoji_id))
-                    )
+                    ),
+                    session=session,
                 )
             except Exception:
                 if close_after and session:
@@ -502,7 +505,7 @@ class EmojiHashMap:
 
         session = None
         try:
-            with SQLSession(engine) as session:
+            with session_factory() as session:
                 for server in servers:
                     logger.debug("Loading server %s...", server.name)
 
@@ -534,6 +537,74 @@ class EmojiHashMap:
 
         logger.info(ending_info_message)
 
+    @beartype
+    def _get_least_recently_used_internal_emoji(
+        self, emoji_server: discord.Guild
+    ) -> discord.Emoji | None:
+        """Return the emoji in the emoji server that was least recently used for bridging. Emoji in the server that aren't in the hash map are considered older than any that are.
+
+        #### Args:
+            - `emoji_server`: The emoji server.
+        """
+        for emoji in emoji_server.emojis:
+            if emoji.id not in self._internal_emoji_usage:
+                return emoji
+
+        for emoji_id in self._internal_emoji_usage:
+            if emoji := emoji_server.get_emoji(emoji_id):
+                return emoji
+
+        return None
+
+    @beartype
+    async def _create_emoji_in_server(
+        self,
+        emoji_server: discord.Guild,
+        emoji_name: str,
+        emoji_image: bytes,
+        *,
+        max_attempts: int = 3,
+    ) -> discord.Emoji:
+        """Upload an emoji to the emoji server, throttled by the emoji rate limiter and retrying if Discord tells us we're being rate limited.
+
+        #### Args:
+            - `emoji_server`: The emoji server.
+            - `emoji_name`: The name of the emoji.
+            - `emoji_image`: The emoji's image.
+            - `max_attempts`: The number of times to try the upload before giving up on rate limits. Defaults to 3.
+
+        #### Raises:
+            - `Forbidden`: Emoji server permissions not set correctly.
+            - `HTTPException`: Uploading the emoji failed.
+
+        #### Returns:
+            - `discord.Emoji`: The emoji that was created.
+        """
+        emoji_rate_limiter = globals.get_emoji_rate_limiter()
+        attempt = 0
+        while True:
+            attempt += 1
+            async with emoji_rate_limiter:
+                try:
+                    return await emoji_server.create_custom_emoji(
+                        name=emoji_name, image=emoji_image, reason="Bridging reaction."
+                    )
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt >= max_attempts:
+                        raise
+
+                    try:
+                        retry_after = float(e.response.headers.get("Retry-After", 0))
+                    except (AttributeError, ValueError):
+                        retry_after = 0.0
+
+            retry_after = max(retry_after, 2 ** (attempt - 1))
+            logger.debug(
+                "Rate limited uploading emoji to emoji server, retrying in %s seconds.",
+                retry_after,
+            )
+            await asyncio.sleep(retry_after)
+
     @beartype
     async def copy_emoji_into_server(
         self,
@@ -564,9 +635,9 @@ class EmojiHashMap:
             - `RuntimeError`: Session connection to the server to fetch image from URL failed.
             - `ServerTimeoutError`: Connection to server to fetch image from URL timed out.
         """
-        if not globals.emoji_server:
+        if not (emoji_server := await globals.get_emoji_server()):
             return None
-        emoji_server_id = globals.emoji_server.id
+        emoji_server_id = emoji_server.id
 
         if not emoji_image:
             logger.debug(
@@ -594,31 +665,28 @@ class EmojiHashMap:
 
         emoji_to_delete_id = None
         try:
-            emoji = await globals.emoji_server.create_custom_emoji(
-                name=emoji_to_copy_name, image=emoji_image, reason="Bridging reaction."
+            emoji = await self._create_emoji_in_server(
+                emoji_server, emoji_to_copy_name, emoji_image
             )
         except discord.Forbidden:
             logger.warning("Emoji server permissions not set correctly.")
             raise
-        except discord.HTTPException:
-            if len(globals.emoji_server.emojis) < 50:
+        except discord.HTTPException as e:
+            if e.status == 429 or len(emoji_server.emojis) < 50:
                 # Something weird happened, the error was not due to a full server
                 raise
 
-            # Try to delete an emoji from the server and then add this again.
-            emoji_to_delete: discord.Emoji | None = None
-            emoji_to_delete = random.choice(globals.emoji_server.emojis)
-            emoji_to_delete_id = emoji_to_delete.id
+            # Try to delete the least recently used emoji from the server and then add this again.
+            emoji_to_delete = self._get_least_recently_used_internal_emoji(emoji_server)
             if not emoji_to_delete:
                 raise Exception("emoji_to_delete failed to be fetched somehow.")
+            emoji_to_delete_id = emoji_to_delete.id
 
             await emoji_to_delete.delete()
 
             try:
-                emoji = await globals.emoji_server.create_custom_emoji(
-                    name=emoji_to_copy_name,
-                    image=emoji_image,
-                    reason="Bridging reaction.",
+                emoji = await self._create_emoji_in_server(
+                    emoji_server, emoji_to_copy_name, emoji_image
                 )
             except discord.Forbidden:
                 logger.warning("Emoji server permissions not set correctly.")
@@ -626,7 +694,7 @@ class EmojiHashMap:
 
         # Copied the emoji, going to update my table
         if not session:
-            session = SQLSession(engine)
+            session = session_factory()
             close_after = True
         else:
             close_after = False
@@ -737,7 +805,7 @@ class EmojiHashMap:
         close_after = False
         try:
             if not session:
-                session = SQLSession(engine)
+                session = session_factory()
                 close_after = True
             if not image_hash:
                 if partial_or_full_emoji := (external_emoji or full_emoji):
@@ -856,7 +924,11 @@ class EmojiHashMap:
         if not (image_hash := self._emoji_to_hash.get(emoji_id)):
             return None
 
-        return self._hash_to_internal_emoji.get(image_hash)
+        if internal_emoji_id := self._hash_to_internal_emoji.get(image_hash):
+            if internal_emoji_id in self._internal_emoji_usage:
+                self._internal_emoji_usage.move_to_end(internal_emoji_id)
+
+        return internal_emoji_id
 
     @beartype
     def get_accessible_emoji(
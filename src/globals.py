@@ -2,19 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-import io
 import json
-from hashlib import md5
-from typing import Any, Callable, Literal, SupportsInt, TypedDict, TypeVar, cast
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from functools import cache, lru_cache, wraps
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Literal,
+    Mapping,
+    SupportsInt,
+    TypedDict,
+    TypeVar,
+    cast,
+)
+from urllib.parse import urlsplit
 
-import aiohttp
 import discord
-from aiolimiter import AsyncLimiter
 from beartype import beartype
 from typing_extensions import NotRequired
 
 from validations import ArgumentError, HTTPResponseError, logger, validate_channels
 
+if TYPE_CHECKING:
+    import aiohttp
+    from aiolimiter import AsyncLimiter
+
 # discord.guild.GuildChannel isn't working in commands.py for some reason
 GuildChannel = (
     discord.VoiceChannel
@@ -24,6 +46,27 @@ GuildChannel = (
     | discord.CategoryChannel
 )
 
+# Types accepted by the channel helpers that are called on every bridged message, as tuples so isinstance() checks stay cheap
+channel_or_id_types = (
+    int,
+    discord.VoiceChannel,
+    discord.StageChannel,
+    discord.ForumChannel,
+    discord.TextChannel,
+    discord.CategoryChannel,
+    discord.Thread,
+    discord.abc.PrivateChannel,
+    discord.PartialMessageable,
+)
+guild_channel_or_thread_types = (
+    discord.VoiceChannel,
+    discord.StageChannel,
+    discord.ForumChannel,
+    discord.TextChannel,
+    discord.CategoryChannel,
+    discord.Thread,
+)
+
 
 class Settings(TypedDict):
     """
@@ -66,6 +109,8 @@ class Settings(TypedDict):
         The ID of a Discord server for storing custom emoji. The bot must have `Create Expressions` and `Manage Expressions` permissions in the server.
     whitelisted_apps : NotRequired[list[SupportsInt | str]]
         A list of IDs of applications whose outputs are bridged.
+    http_pool_size : NotRequired[int]
+        The maximum number of simultaneous connections the bot keeps open when fetching images. Defaults to 200.
     """
 
     app_token: str
@@ -78,51 +123,239 @@ class Settings(TypedDict):
     db_name: str
     emoji_server_id: NotRequired[SupportsInt | str]
     whitelisted_apps: NotRequired[list[SupportsInt | str]]
+    http_pool_size: NotRequired[int]
 
 
-settings_root: dict[str, str | Settings] = json.load(open("settings.json"))
-assert isinstance(settings_root["context"], str)
-context = settings_root["context"]
-settings: Settings = cast(Settings, settings_root[context])
+@cache
+def load_settings() -> Mapping[str, str | Settings]:
+    """Read and parse the `settings.json` file, using orjson if it is installed. The file is only read the first time this is called.
 
-# Variables for connection to the Discord client
-client = discord.Client(
-    intents=discord.Intents(
-        emojis_and_stickers=True,
-        guilds=True,
-        members=True,
-        message_content=True,
-        messages=True,
-        reactions=True,
-        typing=True,
-        webhooks=True,
-    )
+    #### Returns:
+        - `Mapping[str, str | Settings]`: A read-only view of the contents of the file.
+    """
+    with open("settings.json", "rb") as settings_file:
+        settings_bytes = settings_file.read()
+
+    try:
+        import orjson
+
+        parsed_settings = orjson.loads(settings_bytes)
+    except ImportError:
+        parsed_settings = json.loads(settings_bytes)
+
+    return MappingProxyType(parsed_settings)
+
+
+# Settings are only read from settings.json the first time one of these is accessed, through the module's __getattr__()
+settings_root: Mapping[str, str | Settings]
+context: str
+settings: Settings
+app_token: str
+db_url: str
+emoji_server_id: int | None
+whitelisted_apps: frozenset[int]
+settings_attributes = frozenset(
+    {
+        "settings_root",
+        "context",
+        "settings",
+        "app_token",
+        "db_url",
+        "emoji_server_id",
+        "whitelisted_apps",
+    }
 )
+
+
+@cache
+def load_settings_attributes():
+    """Read the settings and set the module attributes derived from them, including frequently used settings that are parsed once here. Only does anything the first time it is called."""
+    global settings_root, context, settings
+    global app_token, db_url, emoji_server_id, whitelisted_apps
+
+    settings_root = load_settings()
+    assert isinstance(settings_root["context"], str)
+    context = settings_root["context"]
+    settings = cast(Settings, settings_root[context])
+
+    app_token = settings["app_token"]
+    db_url = f"{settings['db_dialect']}+{settings['db_driver']}://{settings['db_user']}:{settings['db_pwd']}@{settings['db_host']}:{settings['db_port']}/{settings['db_name']}"
+    try:
+        emoji_server_id = (
+            int(emoji_server_id_raw)
+            if (emoji_server_id_raw := settings.get("emoji_server_id"))
+            else None
+        )
+    except Exception:
+        logger.warning(
+            "Emoji server ID stored in settings.json file does not resolve to a valid integer."
+        )
+        emoji_server_id = None
+    whitelisted_apps = frozenset(
+        int(app_id) for app_id in settings.get("whitelisted_apps", [])
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Load the settings the first time one of the attributes derived from them is accessed. After that they are regular module attributes and this is no longer called for them.
+
+    #### Args:
+        - `name`: The name of the attribute being accessed.
+
+    #### Raises:
+        - `AttributeError`: There is no attribute with that name.
+    """
+    if name in settings_attributes:
+        load_settings_attributes()
+        return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class BridgeBotClient(discord.Client):
+    """Discord client that keeps its connections to Discord alive for longer and also releases the bot's own resources when it is closed."""
+
+    async def login(self, token: str):
+        """Set up the connection pool shared by all requests to the Discord API, including webhook requests, and then log in.
+
+        #### Args:
+            - `token`: The bot's token.
+        """
+        import aiohttp
+
+        # Webhooks fetched through the client reuse its HTTP session, so bridged messages are sent over connections that are already open
+        self.http.connector = aiohttp.TCPConnector(
+            limit=0, keepalive_timeout=75, use_dns_cache=True, ttl_dns_cache=300
+        )
+        await super().login(token)
+
+    async def close(self):
+        """Close the shared HTTP session and then the connection to Discord."""
+        await close_http_session()
+        await super().close()
+
+
+def build_intents() -> discord.Intents:
+    """Return the intents the bot needs to connect to Discord."""
+    return discord.Intents._from_value(
+        discord.Intents.emojis_and_stickers.flag
+        | discord.Intents.guilds.flag
+        | discord.Intents.members.flag
+        | discord.Intents.message_content.flag
+        | discord.Intents.messages.flag
+        | discord.Intents.reactions.flag
+        | discord.Intents.typing.flag
+        | discord.Intents.webhooks.flag
+    )
+
+
+# Variables for connection to the Discord client
+intents = build_intents()
+client = BridgeBotClient(intents=intents)
 command_tree = discord.app_commands.CommandTree(client)
 
-# This one is set to True once the bot has been initialised in main.py
-is_ready: bool = False
+# This one is set once the bot has been initialised in main.py
+ready_event = asyncio.Event()
 
-# Channels which will automatically create threads in bridged channels
-auto_bridge_thread_channels: set[int] = set()
+# Lock held while replacing the snapshots below, so concurrent writers can't lose each other's changes when running without the GIL; readers don't need it
+state_lock = threading.Lock()
 
-# Server which can be used to store unknown emoji for mirroring reactions
-emoji_server: discord.Guild | None = None
+# Channels which will automatically create threads in bridged channels, replaced as a whole by add_auto_bridge_thread_channels() and remove_auto_bridge_thread_channels()
+auto_bridge_thread_channels: frozenset[int] = frozenset()
 
-# Dictionary listing all apps whitelisted per channel
-per_channel_whitelist: dict[int, set[int]] = {}
+# Channels that weren't in the client's cache and were fetched from the Discord API, mapping each ID to the time it was fetched and the channel (or None if it doesn't exist)
+fetched_channels: dict[
+    int,
+    tuple[
+        float,
+        GuildChannel
+        | discord.Thread
+        | discord.abc.PrivateChannel
+        | discord.PartialMessageable
+        | None,
+    ],
+] = {}
+fetched_channel_ttl = 300
+channel_fetches: dict[
+    int,
+    asyncio.Task[
+        GuildChannel
+        | discord.Thread
+        | discord.abc.PrivateChannel
+        | discord.PartialMessageable
+        | None
+    ],
+] = {}
 
-# Helper to prevent us from being rate limited
-rate_limiter = AsyncLimiter(1, 10)
+# Server which can be used to store unknown emoji for mirroring reactions, loaded by get_emoji_server()
+emoji_server: discord.Guild | None = None
+emoji_server_loaded: bool = False
+
+# Read-only dictionary listing all apps whitelisted per channel, replaced as a whole by rebuild_whitelist() and update_channel_whitelist()
+per_channel_whitelist: Mapping[int, frozenset[int]] = MappingProxyType({})
+
+# Members that weren't cached and are waiting to be looked up, per server, and the tasks that will look them up
+pending_member_fetches: dict[
+    int, list[tuple[int, asyncio.Future[discord.Member | None]]]
+] = {}
+member_fetch_tasks: set[asyncio.Task[None]] = set()
+member_fetch_window = 0.02
+
+# Members that weren't cached and were looked up, mapping the server and member IDs to the time they were looked up and the member (or None if they weren't found)
+fetched_members: dict[tuple[int, int], tuple[float, discord.Member | None]] = {}
+fetched_member_ttl = 300
+missing_member_ttl = 60
+
+# Helper to prevent us from being rate limited, created by get_rate_limiter()
+rate_limiter: AsyncLimiter | None = None
+
+# Helper to keep emoji uploads to the emoji server within Discord's limits, created by get_emoji_rate_limiter()
+emoji_rate_limiter: AsyncLimiter | None = None
+max_emoji_uploads_per_minute = 30
+
+# HTTP session for fetching images, created by get_http_session()
+http_session: aiohttp.ClientSession | None = None
+
+# Templates for the URLs of custom emoji images in Discord's CDN
+emoji_url_template = "https://cdn.discordapp.com/emojis/%d.png?v=1"
+animated_emoji_url_template = "https://cdn.discordapp.com/emojis/%d.gif?v=1"
+
+# Limits on concurrent requests made through the HTTP session, per host
+host_semaphores: dict[str, asyncio.Semaphore] = {}
+max_requests_per_host = 64
+
+# Default limit on the number of connections open at once in the HTTP session, which can be overridden with the http_pool_size setting
+default_http_pool_size = 200
+
+# Cache of images fetched from URLs, in least-recently-used order, mapping each URL to the time it was fetched and the image itself
+image_cache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+image_cache_fresh_seconds = 3600
+image_cache_stale_seconds = 86400
+image_cache_max_size = 1000
+image_refresh_tasks: dict[str, asyncio.Task[None]] = {}
+image_fetches: dict[str, asyncio.Task[bytes]] = {}
+
+# On-disk cache of images fetched from URLs, so that they survive restarts
+image_disk_cache_dir = os.path.join(".bridge-cache", "images")
+image_disk_cache_max_bytes = 512 * 1024 * 1024
+image_disk_cache_max_age = 30 * 86400
+image_disk_cache_size: int | None = None
+image_disk_cache_lock = threading.Lock()
 
 # Variable to keep track of messages that are still being bridged/edited before they can be edited/deleted
 message_lock: dict[int, asyncio.Lock] = {}
 
+# Limit on how many calls made through run_retries() can be in flight at once, so large fan-outs don't flood the connection pools
+max_concurrent_retried_calls = 64
+retry_semaphore = asyncio.Semaphore(max_concurrent_retried_calls)
+
+# Limit on how many channels can have their webhooks fetched at once when loading bridges, so startup doesn't burst through Discord's rate limits
+max_concurrent_webhook_fetches = 20
+
 # Type wildcard
 T = TypeVar("T", bound=Any)
 
 
-@beartype
 async def get_channel_from_id(
     channel_or_id: (
         GuildChannel
@@ -148,20 +381,144 @@ async def get_channel_from_id(
     #### Returns:
         - If the argument is a channel, returns it unchanged; otherwise, returns a channel with the ID passed, or None if it couldn't be found.
     """
+    assert isinstance(channel_or_id, channel_or_id_types)
+
     if isinstance(channel_or_id, int):
         channel = client.get_channel(channel_or_id)
         if not channel:
-            try:
-                channel = await client.fetch_channel(channel_or_id)
-            except Exception:
-                channel = None
+            channel = await fetch_channel(channel_or_id)
     else:
         channel = channel_or_id
 
     return channel
 
 
+async def fetch_channel(
+    channel_id: int,
+) -> (
+    GuildChannel
+    | discord.Thread
+    | discord.abc.PrivateChannel
+    | discord.PartialMessageable
+    | None
+):
+    """Fetch a channel that isn't in the client's cache from the Discord API, reusing the result of recent fetches. Concurrent fetches of the same channel are collapsed into a single request.
+
+    #### Args:
+        - `channel_id`: The ID of the channel to fetch.
+
+    #### Returns:
+        - The channel with the ID passed, or None if it couldn't be found.
+    """
+    if (cached_channel := fetched_channels.get(channel_id)) and (
+        time.monotonic() - cached_channel[0] < fetched_channel_ttl
+    ):
+        return cached_channel[1]
+
+    # If this channel is already being fetched, wait for that fetch instead of starting another one
+    if not (channel_fetch := channel_fetches.get(channel_id)):
+        channel_fetch = asyncio.create_task(fetch_channel_from_API(channel_id))
+        channel_fetches[channel_id] = channel_fetch
+        channel_fetch.add_done_callback(lambda _: channel_fetches.pop(channel_id, None))
+
+    return await asyncio.shield(channel_fetch)
+
+
+async def fetch_channel_from_API(
+    channel_id: int,
+) -> (
+    GuildChannel
+    | discord.Thread
+    | discord.abc.PrivateChannel
+    | discord.PartialMessageable
+    | None
+):
+    """Fetch a channel from the Discord API and remember the result in the fetched channel cache.
+
+    #### Args:
+        - `channel_id`: The ID of the channel to fetch.
+
+    #### Returns:
+        - The channel with the ID passed, or None if it couldn't be found.
+    """
+    channel: (
+        GuildChannel
+        | discord.Thread
+        | discord.abc.PrivateChannel
+        | discord.PartialMessageable
+        | None
+    )
+    try:
+        channel = await client.fetch_channel(channel_id)
+    except discord.NotFound:
+        channel = None
+    except Exception:
+        # Don't remember errors that might go away if we try again, such as HTTP errors, connection errors or timeouts
+        return None
+
+    fetched_channels[channel_id] = (time.monotonic(), channel)
+    return channel
+
+
+def invalidate_channel(channel_id: int):
+    """Forget the result of any recent fetch of a channel, so that the next lookup of it goes to the Discord API.
+
+    #### Args:
+        - `channel_id`: The ID of the channel to forget.
+    """
+    fetched_channels.pop(channel_id, None)
+
+
+def invalidate_member(guild_id: int, member_id: int):
+    """Forget the result of any recent fetch of a server member, so that the next lookup of them goes to Discord.
+
+    #### Args:
+        - `guild_id`: The ID of the server.
+        - `member_id`: The ID of the member to forget.
+    """
+    fetched_members.pop((guild_id, member_id), None)
+
+
 @beartype
+async def get_channels_from_ids(
+    channel_ids: Iterable[int],
+) -> dict[
+    int,
+    GuildChannel
+    | discord.Thread
+    | discord.abc.PrivateChannel
+    | discord.PartialMessageable
+    | None,
+]:
+    """Return a dictionary mapping each of the channel IDs passed as argument to its channel, or to None if it couldn't be found. Channels that are not in the client's cache are fetched concurrently.
+
+    #### Args:
+        - `channel_ids`: The IDs of the channels to get.
+    """
+    channels: dict[
+        int,
+        GuildChannel
+        | discord.Thread
+        | discord.abc.PrivateChannel
+        | discord.PartialMessageable
+        | None,
+    ] = {}
+    missing_channel_ids: list[int] = []
+    for channel_id in channel_ids:
+        if channel := client.get_channel(channel_id):
+            channels[channel_id] = channel
+        else:
+            missing_channel_ids.append(channel_id)
+
+    if len(missing_channel_ids) > 0:
+        fetched_channels = await asyncio.gather(
+            *[get_channel_from_id(channel_id) for channel_id in missing_channel_ids]
+        )
+        channels.update(zip(missing_channel_ids, fetched_channels))
+
+    return channels
+
+
 def get_id_from_channel(
     channel_or_id: GuildChannel | discord.Thread | discord.abc.PrivateChannel | int,
 ) -> int:
@@ -173,6 +530,8 @@ def get_id_from_channel(
     #### Returns:
         - `int`: The ID of the channel passed as argument.
     """
+    assert isinstance(channel_or_id, channel_or_id_types)
+
     if isinstance(channel_or_id, int):
         return channel_or_id
 
@@ -218,7 +577,6 @@ async def get_channel_parent(
     return cast(discord.TextChannel, channel.parent)
 
 
-@beartype
 async def get_channel_member(
     channel: GuildChannel | discord.Thread, member_id: int
 ) -> discord.Member | None:
@@ -228,19 +586,229 @@ async def get_channel_member(
         - `channel`: The channel to look for a member in.
         - `member_id`: Their ID.
     """
-    channel_member = channel.guild.get_member(member_id)
-    if not channel_member:
-        try:
-            channel_member = await channel.guild.fetch_member(member_id)
-        except Exception:
-            channel_member = None
+    assert isinstance(channel, guild_channel_or_thread_types)
+    assert isinstance(member_id, int)
+
+    guild = channel.guild
+    if channel_member := guild.get_member(member_id):
+        return channel_member
+
+    if (cached_member := fetched_members.get((guild.id, member_id))) and (
+        time.monotonic() - cached_member[0]
+        < (fetched_member_ttl if cached_member[1] else missing_member_ttl)
+    ):
+        return cached_member[1]
+
+    # Members that aren't cached are looked up in batches, one per server per short window
+    future: asyncio.Future[discord.Member | None] = (
+        asyncio.get_running_loop().create_future()
+    )
+    pending_fetches = pending_member_fetches.get(guild.id)
+    if pending_fetches is None:
+        pending_fetches = []
+        pending_member_fetches[guild.id] = pending_fetches
+        flush_task = asyncio.create_task(flush_member_fetches(guild))
+        member_fetch_tasks.add(flush_task)
+        flush_task.add_done_callback(member_fetch_tasks.discard)
+    pending_fetches.append((member_id, future))
+
+    return await future
+
+
+@beartype
+async def flush_member_fetches(guild: discord.Guild):
+    """Look up all members of a server that were requested from `get_channel_member()` in the last few milliseconds and weren't cached, querying the gateway for up to 100 of them at a time.
+
+    #### Args:
+        - `guild`: The server to look members up in.
+    """
+    await asyncio.sleep(member_fetch_window)
+    pending_fetches = pending_member_fetches.pop(guild.id, [])
+
+    futures_by_member: dict[int, list[asyncio.Future[discord.Member | None]]] = {}
+    for member_id, future in pending_fetches:
+        futures_by_member.setdefault(member_id, []).append(future)
+
+    async def fetch_member(member_id: int) -> discord.Member | None:
+        with suppress(discord.HTTPException):
+            return await guild.fetch_member(member_id)
+        return None
+
+    member_ids = list(futures_by_member.keys())
+    try:
+        for i in range(0, len(member_ids), 100):
+            batch_ids = member_ids[i : i + 100]
+            try:
+                members_found = {
+                    member.id: member
+                    for member in await guild.query_members(
+                        user_ids=batch_ids, limit=100, cache=True
+                    )
+                }
+            except (asyncio.TimeoutError, discord.ClientException):
+                # Couldn't query the gateway, so fall back to fetching them one by one
+                members_found = {
+                    member_id: member
+                    for member_id, member in zip(
+                        batch_ids,
+                        await asyncio.gather(
+                            *[fetch_member(member_id) for member_id in batch_ids]
+                        ),
+                    )
+                    if member
+                }
+
+            fetched_at = time.monotonic()
+            for member_id in batch_ids:
+                member = members_found.get(member_id)
+                fetched_members[(guild.id, member_id)] = (fetched_at, member)
+                for future in futures_by_member[member_id]:
+                    if not future.done():
+                        future.set_result(member)
+    finally:
+        # Nobody should be left waiting forever, even if something went wrong above
+        for futures in futures_by_member.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+
+
+@beartype
+def add_auto_bridge_thread_channels(channel_ids: Iterable[int]):
+    """Mark channels as automatically creating threads across bridges.
+
+    #### Args:
+        - `channel_ids`: The IDs of the channels to add.
+    """
+    global auto_bridge_thread_channels
+    with state_lock:
+        auto_bridge_thread_channels = auto_bridge_thread_channels.union(channel_ids)
+
+
+@beartype
+def remove_auto_bridge_thread_channels(channel_ids: Iterable[int]):
+    """Stop channels from automatically creating threads across bridges.
 
-    return channel_member
+    #### Args:
+        - `channel_ids`: The IDs of the channels to remove.
+    """
+    global auto_bridge_thread_channels
+    with state_lock:
+        auto_bridge_thread_channels = auto_bridge_thread_channels.difference(
+            channel_ids
+        )
+
+
+@beartype
+def rebuild_whitelist(whitelist: Mapping[int, Iterable[int]]):
+    """Replace the per-channel app whitelist.
+
+    #### Args:
+        - `whitelist`: A dictionary mapping channel IDs to the IDs of the apps whitelisted in them.
+    """
+    global per_channel_whitelist
+    frozen_whitelist = MappingProxyType(
+        {
+            channel_id: frozenset(app_ids)
+            for channel_id, app_ids in whitelist.items()
+            if app_ids
+        }
+    )
+    with state_lock:
+        per_channel_whitelist = frozen_whitelist
+
+
+@beartype
+def update_channel_whitelist(
+    channel_id: int,
+    apps_to_add: Iterable[int] = (),
+    apps_to_remove: Iterable[int] = (),
+):
+    """Add and remove apps from a channel's whitelist.
+
+    #### Args:
+        - `channel_id`: The ID of the channel whose whitelist is being updated.
+        - `apps_to_add`: The IDs of apps to add to the whitelist. Defaults to an empty tuple.
+        - `apps_to_remove`: The IDs of apps to remove from the whitelist. Defaults to an empty tuple.
+    """
+    global per_channel_whitelist
+    with state_lock:
+        whitelist = dict(per_channel_whitelist)
+        whitelist[channel_id] = (
+            whitelist.get(channel_id, frozenset())
+            .union(apps_to_add)
+            .difference(apps_to_remove)
+        )
+        if not whitelist[channel_id]:
+            del whitelist[channel_id]
+        per_channel_whitelist = MappingProxyType(whitelist)
+
+
+async def get_emoji_server() -> discord.Guild | None:
+    """Return the server registered in settings.json for storing emoji, looking it up the first time this is called. Returns None if none is registered, it can't be found, or I don't have permission to manage its emoji.
+
+    #### Returns:
+        - `discord.Guild | None`: The emoji server.
+    """
+    global emoji_server, emoji_server_loaded
+    if emoji_server_loaded:
+        return emoji_server
+
+    load_settings_attributes()
+    if not emoji_server_id:
+        logger.info("Emoji server ID not set.")
+        emoji_server_loaded = True
+        return None
+
+    server = client.get_guild(emoji_server_id)
+    if not server:
+        with suppress(discord.HTTPException):
+            server = await client.fetch_guild(emoji_server_id)
+
+    if not server:
+        logger.warning(
+            "Couldn't find emoji server with ID registered in settings.json."
+        )
+    elif (
+        not server.me.guild_permissions.manage_expressions
+        or not server.me.guild_permissions.create_expressions
+    ):
+        logger.warning(
+            "I don't have Create Expressions and Manage Expressions permissions in the emoji server."
+        )
+    else:
+        emoji_server = server
+        logger.info("Emoji server loaded.")
+
+    emoji_server_loaded = True
+    return emoji_server
+
+
+def get_rate_limiter() -> AsyncLimiter:
+    """Return the rate limiter used to throttle typing across bridges, creating it the first time this is called."""
+    global rate_limiter
+    if rate_limiter is None:
+        from aiolimiter import AsyncLimiter
+
+        rate_limiter = AsyncLimiter(1, 10)
+
+    return rate_limiter
+
+
+def get_emoji_rate_limiter() -> AsyncLimiter:
+    """Return the rate limiter used to throttle emoji uploads to the emoji server, creating it the first time this is called."""
+    global emoji_rate_limiter
+    if emoji_rate_limiter is None:
+        from aiolimiter import AsyncLimiter
+
+        emoji_rate_limiter = AsyncLimiter(max_emoji_uploads_per_minute, 60)
+
+    return emoji_rate_limiter
 
 
 @beartype
 async def get_image_from_URL(url: str) -> bytes:
-    """Return an image stored in a URL.
+    """Return an image stored in a URL. Images fetched recently are served from a cache; images that are past their freshness window but not yet expired are served from the cache while they are refreshed in the background.
 
     #### Args:
         - `url`: The URL of the image to get.
@@ -251,11 +819,242 @@ async def get_image_from_URL(url: str) -> bytes:
         - `RuntimeError`: Session connection failed.
         - `ServerTimeoutError`: Connection to server timed out.
     """
-    image_bytes: io.BytesIO | None = None
-    async with aiohttp.ClientSession(
-        headers={"User-Agent": "Discord Channel Bridge Bot/1.0"}
-    ) as session:
+    if cached_image := image_cache.get(url):
+        fetched_at, image = cached_image
+        image_age = time.monotonic() - fetched_at
+        if image_age < image_cache_fresh_seconds:
+            image_cache.move_to_end(url)
+            return image
+
+        if image_age < image_cache_stale_seconds:
+            image_cache.move_to_end(url)
+            if url not in image_refresh_tasks:
+                image_refresh_tasks[url] = asyncio.create_task(
+                    refresh_cached_image(url)
+                )
+            return image
+
+        del image_cache[url]
+
+    # If this image is already being fetched, wait for that fetch instead of starting another one
+    if not (image_fetch := image_fetches.get(url)):
+        image_fetch = asyncio.create_task(load_image(url))
+        image_fetches[url] = image_fetch
+        image_fetch.add_done_callback(lambda _: image_fetches.pop(url, None))
+
+    image = await asyncio.shield(image_fetch)
+    cache_image(url, image)
+    return image
+
+
+@beartype
+async def refresh_cached_image(url: str):
+    """Fetch an image again and update its entry in the image cache. If the fetch fails, the stale entry is kept.
+
+    #### Args:
+        - `url`: The URL of the image to refresh.
+    """
+    try:
+        image = await fetch_image_from_URL(url)
+        cache_image(url, image)
+        await asyncio.to_thread(write_image_to_disk, url, image)
+    except Exception as e:
+        logger.warning("Failed to refresh cached image from URL %s: %s", url, e)
+    finally:
+        image_refresh_tasks.pop(url, None)
+
+
+@beartype
+async def load_image(url: str) -> bytes:
+    """Return an image stored in a URL from the on-disk image cache or, if it isn't there, fetch it and store it there.
+
+    #### Args:
+        - `url`: The URL of the image to get.
+
+    #### Raises:
+        - `HTTPResponseError`: HTTP request to fetch image returned a status other than 200.
+        - `InvalidURL`: Argument was not a valid URL.
+        - `RuntimeError`: Session connection failed.
+        - `ServerTimeoutError`: Connection to server timed out.
+    """
+    if (image := await asyncio.to_thread(read_image_from_disk, url)) is not None:
+        return image
+
+    image = await fetch_image_from_URL(url)
+    await asyncio.to_thread(write_image_to_disk, url, image)
+    return image
+
+
+@beartype
+def get_image_disk_path(url: str) -> str:
+    """Return the path of the file an image is stored in in the on-disk image cache.
+
+    #### Args:
+        - `url`: The URL the image was fetched from.
+    """
+    from hashlib import md5
+
+    return os.path.join(
+        image_disk_cache_dir, md5(url.encode(), usedforsecurity=False).hexdigest()
+    )
+
+
+@beartype
+def read_image_from_disk(url: str) -> bytes | None:
+    """Return an image from the on-disk image cache, or None if it isn't there or has expired. This blocks, so it should be run in a separate thread.
+
+    #### Args:
+        - `url`: The URL the image was fetched from.
+    """
+    image_path = get_image_disk_path(url)
+    try:
+        if time.time() - os.path.getmtime(image_path) > image_disk_cache_max_age:
+            return None
+
+        with open(image_path, "rb") as image_file:
+            return image_file.read()
+    except OSError:
+        return None
+
+
+@beartype
+def write_image_to_disk(url: str, image: bytes):
+    """Store an image in the on-disk image cache, deleting the oldest images in it if it grows past its size limit. Errors are logged and otherwise ignored. This blocks, so it should be run in a separate thread.
+
+    #### Args:
+        - `url`: The URL the image was fetched from.
+        - `image`: The image bytes object.
+    """
+    global image_disk_cache_size
+    image_path = get_image_disk_path(url)
+    try:
+        with image_disk_cache_lock:
+            os.makedirs(image_disk_cache_dir, exist_ok=True)
+            if image_disk_cache_size is None:
+                image_disk_cache_size = sum(
+                    entry.stat().st_size
+                    for entry in os.scandir(image_disk_cache_dir)
+                    if entry.is_file()
+                )
+
+            try:
+                image_disk_cache_size -= os.path.getsize(image_path)
+            except OSError:
+                pass
+
+            # Write to a temporary file first so a reader never sees a partly written image
+            temporary_path = f"{image_path}.tmp"
+            with open(temporary_path, "wb") as image_file:
+                image_file.write(image)
+            os.replace(temporary_path, image_path)
+            image_disk_cache_size += len(image)
+
+            if image_disk_cache_size > image_disk_cache_max_bytes:
+                # Delete the oldest images until we're comfortably below the limit
+                cached_files = sorted(
+                    (
+                        entry
+                        for entry in os.scandir(image_disk_cache_dir)
+                        if entry.is_file()
+                    ),
+                    key=lambda entry: entry.stat().st_mtime,
+                )
+                for entry in cached_files:
+                    if image_disk_cache_size <= image_disk_cache_max_bytes * 0.9:
+                        break
+
+                    file_size = entry.stat().st_size
+                    os.remove(entry.path)
+                    image_disk_cache_size -= file_size
+    except OSError as e:
+        logger.warning("Failed to store image from URL %s on disk: %s", url, e)
+
+
+@beartype
+def cache_image(url: str, image: bytes):
+    """Store an image in the image cache, evicting the least recently used images if it is full.
+
+    #### Args:
+        - `url`: The URL the image was fetched from.
+        - `image`: The image bytes object.
+    """
+    image_cache[url] = (time.monotonic(), image)
+    image_cache.move_to_end(url)
+    while len(image_cache) > image_cache_max_size:
+        image_cache.popitem(last=False)
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the HTTP session shared by all requests the bot makes outside of the Discord API, creating it the first time this is called."""
+    global http_session
+    if http_session is None or http_session.closed:
+        import aiohttp
+
+        load_settings_attributes()
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=int(settings.get("http_pool_size", default_http_pool_size)),
+                limit_per_host=max_requests_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            ),
+            headers={"User-Agent": "Discord Channel Bridge Bot/1.0"},
+        )
+
+    return http_session
+
+
+async def close_http_session():
+    """Close the shared HTTP session, if it has been created."""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+
+@beartype
+def get_host_semaphore(url: str) -> asyncio.Semaphore:
+    """Return the semaphore limiting the number of concurrent requests to the host of a URL.
+
+    #### Args:
+        - `url`: The URL that is going to be requested.
+    """
+    host = urlsplit(url).hostname or ""
+    semaphore = host_semaphores.get(host)
+    if not semaphore:
+        semaphore = asyncio.Semaphore(max_requests_per_host)
+        host_semaphores[host] = semaphore
+
+    return semaphore
+
+
+@beartype
+async def fetch_image_from_URL(url: str) -> bytes:
+    """Fetch an image stored in a URL, bypassing the image cache.
+
+    #### Args:
+        - `url`: The URL of the image to get.
+
+    #### Raises:
+        - `HTTPResponseError`: HTTP request to fetch image returned a status other than 200.
+        - `InvalidURL`: Argument was not a valid URL.
+        - `RuntimeError`: Session connection failed.
+        - `ServerTimeoutError`: Connection to server timed out.
+    """
+    session = await get_http_session()
+    async with get_host_semaphore(url):
         async with session.get(url) as response:
+            # If the host tells us we've used up our requests, hold off the next request to it until the limit resets
+            reset_after = 0.0
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                try:
+                    reset_after = float(
+                        response.headers.get("X-RateLimit-Reset-After", 0)
+                    )
+                except ValueError:
+                    pass
+
             if response.status != 200:
                 err = HTTPResponseError(
                     f"Error in function {inspect.stack()[1][3]}(): failed to retrieve image from URL. HTTP status {response.status}."
@@ -263,15 +1062,12 @@ async def get_image_from_URL(url: str) -> bytes:
                 logger.error(err)
                 raise err
 
-            response_buffer = await response.read()
-            image_bytes = io.BytesIO(response_buffer)
+            image = await response.read()
 
-    if not image_bytes:
-        err = Exception("Unknown problem occurred trying to fetch image.")
-        logger.error(err)
-        raise err
+        if reset_after > 0:
+            await asyncio.sleep(reset_after)
 
-    return image_bytes.read()
+    return image
 
 
 @beartype
@@ -280,7 +1076,7 @@ def get_emoji_information(
     emoji_id: int | str | None = None,
     emoji_name: str | None = None,
 ) -> tuple[int, str, bool, str]:
-    """Return a tuple with emoji ID, emoji name, whether the emoji is animated, and the URL for its image.
+    """Return a tuple with emoji ID, emoji name, whether the emoji is animated, and the URL for its image. Callers that already know whether they have an emoji object or an ID and name should call `get_emoji_information_from_emoji()` or `get_emoji_information_from_id()` directly instead.
 
     #### Args:
         - `emoji`: A Discord emoji. Defaults to None, in which case the values below will be used instead.
@@ -291,58 +1087,93 @@ def get_emoji_information(
         - `ArgumentError`: Neither `emoji` nor `emoji_id` were passed, or `emoji_id` was passed but not `emoji_name`.
         - `ValueError`: `emoji` argument was passed and had type `PartialEmoji` but it was not a custom emoji, or `emoji_id` argument was passed and had type `str` but it was not a valid numerical ID.
     """
-    if not emoji:
-        if emoji_id:
-            if not emoji_name:
-                err = ArgumentError(
-                    f"Error in function {inspect.stack()[1][3]}(): if emoji_id is passed as argument to get_emoji_information(), emoji_name must also be."
-                )
-                logger.error(err)
-                raise err
-        else:
-            err = ArgumentError(
-                f"Error in function {inspect.stack()[1][3]}(): at least one of emoji or emoji_id must be passed as argument to get_emoji_information()."
-            )
-            logger.error(err)
-            raise err
-
     if emoji:
-        if not emoji.id:
-            err = ValueError(
-                f"Error in function {inspect.stack()[1][3]}(): PartialEmoji passed as argument to get_emoji_information() is not a custom emoji."
-            )
-            logger.error(err)
-            raise err
+        return get_emoji_information_from_emoji(emoji)
 
-        emoji_id = emoji.id
-        emoji_name = emoji.name
-        emoji_animated = emoji.animated
-        emoji_url = emoji.url
-    else:
-        assert emoji_id and isinstance(emoji_name, str)
+    if not emoji_id:
+        err = ArgumentError(
+            f"Error in function {inspect.stack()[1][3]}(): at least one of emoji or emoji_id must be passed as argument to get_emoji_information()."
+        )
+        logger.error(err)
+        raise err
 
-        emoji_animated = emoji_name.startswith("a:")
-        if emoji_animated:
-            emoji_name = emoji_name[2:]
-        elif emoji_name.startswith(":"):
-            emoji_name = emoji_name[1:]
+    if not emoji_name:
+        err = ArgumentError(
+            f"Error in function {inspect.stack()[1][3]}(): if emoji_id is passed as argument to get_emoji_information(), emoji_name must also be."
+        )
+        logger.error(err)
+        raise err
 
-        if emoji_animated:
-            ext = "gif"
-        else:
-            ext = "png"
-        emoji_url = f"https://cdn.discordapp.com/emojis/{emoji_id}.{ext}?v=1"
+    return get_emoji_information_from_id(emoji_id, emoji_name)
 
+
+@beartype
+def get_emoji_information_from_emoji(
+    emoji: discord.PartialEmoji | discord.Emoji,
+) -> tuple[int, str, bool, str]:
+    """Return a tuple with emoji ID, emoji name, whether the emoji is animated, and the URL for its image.
+
+    #### Args:
+        - `emoji`: A Discord emoji.
+
+    #### Raises:
+        - `ValueError`: `emoji` had type `PartialEmoji` but it was not a custom emoji.
+    """
+    if not emoji.id:
+        err = ValueError(
+            f"Error in function {inspect.stack()[1][3]}(): PartialEmoji passed as argument to get_emoji_information_from_emoji() is not a custom emoji."
+        )
+        logger.error(err)
+        raise err
+
+    return (emoji.id, emoji.name, emoji.animated, emoji.url)
+
+
+@beartype
+def get_emoji_information_from_id(
+    emoji_id: int | str, emoji_name: str
+) -> tuple[int, str, bool, str]:
+    """Return a tuple with emoji ID, emoji name, whether the emoji is animated, and the URL for its image.
+
+    #### Args:
+        - `emoji_id`: The ID of an emoji.
+        - `emoji_name`: The name of the emoji. If it starts with `"a:"` the emoji will be marked as animated.
+
+    #### Raises:
+        - `ValueError`: `emoji_id` had type `str` but it was not a valid numerical ID.
+    """
     try:
         emoji_id_int = int(emoji_id)
     except ValueError:
         err = ValueError(
-            f"Error in function {inspect.stack()[1][3]}(): emoji_id was passed as an argument to get_emoji_information() and had type str but was not convertible to an ID."
+            f"Error in function {inspect.stack()[1][3]}(): emoji_id was passed as an argument to get_emoji_information_from_id() and had type str but was not convertible to an ID."
         )
         logger.error(err)
         raise err
 
-    return (emoji_id_int, emoji_name, emoji_animated, emoji_url)
+    emoji_animated = emoji_name[:2] == "a:"
+    if emoji_animated:
+        emoji_name = emoji_name[2:]
+    elif emoji_name[:1] == ":":
+        emoji_name = emoji_name[1:]
+
+    return (
+        emoji_id_int,
+        emoji_name,
+        emoji_animated,
+        _emoji_url(emoji_id_int, emoji_animated),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _emoji_url(emoji_id: int, animated: bool) -> str:
+    """Return the URL of the image of a custom emoji in Discord's CDN.
+
+    #### Args:
+        - `emoji_id`: The ID of the emoji.
+        - `animated`: Whether the emoji is animated.
+    """
+    return (animated_emoji_url_template if animated else emoji_url_template) % emoji_id
 
 
 @beartype
@@ -352,7 +1183,10 @@ def hash_image(image: bytes) -> str:
     #### Args:
         - `image`: The image bytes object.
     """
-    return md5(image).hexdigest()
+    from hashlib import md5
+
+    # The hash only identifies identical images, so it doesn't need the security-checked implementation
+    return md5(image, usedforsecurity=False).hexdigest()
 
 
 @beartype
@@ -370,68 +1204,129 @@ def truncate(msg: str, length: int) -> str:
 
 
 @beartype
-async def wait_until_ready(
-    *, time_to_wait: float | int = 100, polling_rate: float | int = 1
-) -> bool:
+async def wait_until_ready(*, time_to_wait: float | int = 100) -> bool:
     """Return True when the bot is ready or False if it times out.
 
     #### Args:
         - `time_to_wait`: The amount of time in seconds to wait for the bot to get ready. Values less than 0 will be treated as 0. Defaults to 100.
-        - `polling_rate`: The amount of time in seconds to wait between checks for the variable. Values less than 0 will be treated as 0. Defaults to 1.
     """
-    global is_ready
-    if is_ready:
+    if ready_event.is_set():
         return True
 
-    time_to_wait = max(time_to_wait, 0.0)
-    polling_rate = max(polling_rate, 0.0)
-    time_waited = 0.0
-    while not is_ready and time_waited < time_to_wait:
-        await asyncio.sleep(polling_rate)
-        time_waited += polling_rate
-
-    if time_waited >= time_to_wait:
+    try:
+        await asyncio.wait_for(ready_event.wait(), timeout=max(time_to_wait, 0.0))
+    except asyncio.TimeoutError:
         logger.warning("Taking forever to get ready.")
         return False
     return True
 
 
 @beartype
-async def run_retries(
-    fun: Callable[..., T],
+def with_retries(
     num_retries: int,
     time_to_wait: float | int = 5,
     exceptions_to_catch: type | tuple[type] | None = None,
-) -> T:
-    """Run a function and retry it every time an exception occurs up to a certain maximum number of tries. If it succeeds, return its result; otherwise, raise the error.
+) -> Callable[[Callable[..., T | Awaitable[T]]], Callable[..., Coroutine[Any, Any, T]]]:
+    """Return a decorator that makes a function retry every time an exception occurs up to a certain maximum number of tries. The decorated function is a coroutine function that returns the result of the original one if it succeeds and raises the error otherwise.
 
     #### Args:
-        - `fun`: The function to run.
         - `num_retries`: The number of times to try the function again. If set to 0 or less, will be set to 1.
-        - `time_to_wait`: Time in seconds to wait between retries; only used if `num_retries` is greater than 1. If set to 0 or less, will set `num_retries` to 1. Defaults to 5.
+        - `time_to_wait`: Base time in seconds to wait between retries, doubled after every failed attempt; only used if `num_retries` is greater than 1. If set to 0 or less, will set `num_retries` to 1. Defaults to 5.
         - `exceptions_to_catch`: An exception type or a list of exception types to catch. Defaults to None, in which case all types will be caught.
 
     #### Returns:
-        - `T`: The result of calling `fun()`.
+        - `Callable[[Callable[..., T | Awaitable[T]]], Callable[..., Coroutine[Any, Any, T]]]`: The decorator.
     """
     if num_retries < 1:
         num_retries = 1
     elif num_retries > 1 and time_to_wait <= 0:
         num_retries = 1
 
-    for retry in range(num_retries):
-        try:
-            return fun()
-        except Exception as e:
-            if retry < num_retries - 1 and (
-                not exceptions_to_catch or isinstance(e, exceptions_to_catch)
-            ):
-                await asyncio.sleep(time_to_wait)
-            else:
-                raise e
+    catch_all = not exceptions_to_catch
+
+    def decorator(
+        fun: Callable[..., T | Awaitable[T]],
+    ) -> Callable[..., Coroutine[Any, Any, T]]:
+        is_coroutine_function = inspect.iscoroutinefunction(fun)
+
+        @wraps(fun)
+        async def run_with_retries(*args: Any, **kwargs: Any) -> T:
+            for retry in range(num_retries):
+                try:
+                    async with retry_semaphore:
+                        if is_coroutine_function:
+                            return await cast(Awaitable[T], fun(*args, **kwargs))
+
+                        result = fun(*args, **kwargs)
+                        if inspect.isawaitable(result):
+                            result = await result
+                        return cast(T, result)
+                except Exception as e:
+                    if retry < num_retries - 1 and (
+                        catch_all or isinstance(e, cast(type, exceptions_to_catch))
+                    ):
+                        # Exponential backoff with jitter so concurrent retries don't all wake up together
+                        await asyncio.sleep(
+                            time_to_wait * (2**retry) + random.random() * 0.1
+                        )
+                    else:
+                        raise
 
-    err = ValueError(
-        f"Error in function {inspect.stack()[1][3]}(): couldn't run function {fun.__name__}() in {num_retries} retries."
-    )
-    logger.error(err)
-    raise err
+            err = ValueError(
+                f"Error in function {inspect.stack()[1][3]}(): couldn't run function {fun.__name__}() in {num_retries} retries."
+            )
+            logger.error(err)
+            raise err
+
+        return run_with_retries
+
+    return decorator
+
+
+@beartype
+async def run_retries(
+    fun: Callable[..., T | Awaitable[T]],
+    num_retries: int,
+    time_to_wait: float | int = 5,
+    exceptions_to_catch: type | tuple[type] | None = None,
+) -> T:
+    """Run a function and retry it every time an exception occurs up to a certain maximum number of tries. If it succeeds, return its result; otherwise, raise the error.
+
+    #### Args:
+        - `fun`: The function to run. If it returns an awaitable, it will be awaited.
+        - `num_retries`: The number of times to try the function again. If set to 0 or less, will be set to 1.
+        - `time_to_wait`: Base time in seconds to wait between retries, doubled after every failed attempt; only used if `num_retries` is greater than 1. If set to 0 or less, will set `num_retries` to 1. Defaults to 5.
+        - `exceptions_to_catch`: An exception type or a list of exception types to catch. Defaults to None, in which case all types will be caught.
+
+    #### Returns:
+        - `T`: The result of calling `fun()`.
+    """
+    return await with_retries(num_retries, time_to_wait, exceptions_to_catch)(fun)()
+
+
+@beartype
+async def gather_logging_errors(
+    aws: Iterable[Awaitable[T]],
+    description: str,
+) -> list[T]:
+    """Run several awaitables concurrently and return the results of the ones that succeeded, in order. Errors raised by any of them are logged instead of cancelling or discarding the others.
+
+    #### Args:
+        - `aws`: The awaitables to run.
+        - `description`: What the awaitables were doing, used in the error message, e.g. `"bridge a message"`.
+
+    #### Returns:
+        - `list[T]`: The results of the awaitables that didn't raise an error.
+    """
+    results: list[T] = []
+    for result in await asyncio.gather(*aws, return_exceptions=True):
+        if not isinstance(result, BaseException):
+            results.append(result)
+        elif isinstance(result, Exception):
+            logger.error(
+                "An error occurred while trying to %s: %s", description, result
+            )
+        else:
+            raise result
+
+    return results
@@ -4,7 +4,7 @@ import asyncio
 import inspect
 import re
 from copy import deepcopy
-from typing import Any, Coroutine, NamedTuple, TypedDict, cast, overload
+from typing import Any, Coroutine, NamedTuple, Sequence, TypedDict, cast, overload
 
 import discord
 from beartype import beartype
@@ -25,10 +25,18 @@ from database import (
     DBAutoBridgeThreadChannels,
     DBMessageMap,
     DBReactionMap,
-    engine,
+    cache_message_maps,
+    get_cached_message_maps_with_same_source,
+    get_message_maps_from_source,
+    insert_message_maps,
+    pop_message_maps_from_source,
+    select_message_maps_with_same_source,
+    select_reaction_maps_by_source,
+    session_factory,
+    sql_commit,
     sql_retry,
 )
-from validations import logger
+from validations import TextChannelOrThread, logger
 
 
 class ThreadSplat(TypedDict, total=False):
@@ -37,6 +45,10 @@ class ThreadSplat(TypedDict, total=False):
     thread: discord.Thread
 
 
+# Mentions allowed in bridged messages that shouldn't ping anyone, built once rather than for every message sent
+no_allowed_mentions = discord.AllowedMentions(users=False, roles=False, everyone=False)
+
+
 @globals.client.event
 async def on_ready():
     """Load the data registered in the database into memory.
@@ -49,14 +61,14 @@ async def on_ready():
         - `HTTPException`: Deleting an existing webhook or creating a new one failed.
         - `Forbidden`: You do not have permissions to create or delete webhooks for some of the channels in existing Bridges.
     """
-    if globals.is_ready:
+    if globals.ready_event.is_set():
         return
 
     logger.info("Client successfully connected. Running initial loading procedures...")
 
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             await bridges.load_from_database(session)
 
             # Try to identify hashed emoji
@@ -67,11 +79,18 @@ async def on_ready():
             select_whitelisted_apps: SQLSelect[tuple[DBAppWhitelist]] = SQLSelect(
                 DBAppWhitelist
             )
-            whitelisted_apps_query_result: ScalarResult[DBAppWhitelist] = (
-                session.scalars(select_whitelisted_apps)
+            whitelisted_apps_query_result: Sequence[DBAppWhitelist] = session.scalars(
+                select_whitelisted_apps
+            ).all()
+            whitelist_channels = await globals.get_channels_from_ids(
+                {
+                    int(whitelisted_app.channel)
+                    for whitelisted_app in whitelisted_apps_query_result
+                }
             )
             accessible_channels: set[int] = set()
             inaccessible_channels: set[int] = set()
+            per_channel_whitelist: dict[int, set[int]] = {}
             for whitelisted_app in whitelisted_apps_query_result:
                 channel_id = int(whitelisted_app.channel)
                 if channel_id in inaccessible_channels:
@@ -84,7 +103,7 @@ async def on_ready():
                 )
 
                 if channel_id not in accessible_channels:
-                    channel = await globals.get_channel_from_id(channel_id)
+                    channel = whitelist_channels[channel_id]
 
                     if channel:
                         accessible_channels.add(channel_id)
@@ -96,12 +115,10 @@ async def on_ready():
                         inaccessible_channels.add(channel_id)
                         continue
 
-                if not globals.per_channel_whitelist.get(channel_id):
-                    globals.per_channel_whitelist[channel_id] = set()
+                if not per_channel_whitelist.get(channel_id):
+                    per_channel_whitelist[channel_id] = set()
 
-                globals.per_channel_whitelist[channel_id].add(
-                    int(whitelisted_app.application)
-                )
+                per_channel_whitelist[channel_id].add(int(whitelisted_app.application))
 
             if len(inaccessible_channels) > 0:
                 delete_inaccessible_channels = SQLDelete(DBAppWhitelist).where(
@@ -109,6 +126,7 @@ async def on_ready():
                 )
                 session.execute(delete_inaccessible_channels)
 
+            globals.rebuild_whitelist(per_channel_whitelist)
             logger.info("Whitelists loaded.")
             session.commit()
 
@@ -120,13 +138,11 @@ async def on_ready():
             auto_thread_query_result: ScalarResult[DBAutoBridgeThreadChannels] = (
                 session.scalars(select_auto_bridge_thread_channels)
             )
-            globals.auto_bridge_thread_channels = (
-                globals.auto_bridge_thread_channels.union(
-                    {
-                        int(auto_bridge_thread_channel.channel)
-                        for auto_bridge_thread_channel in auto_thread_query_result
-                    }
-                )
+            globals.add_auto_bridge_thread_channels(
+                {
+                    int(auto_bridge_thread_channel.channel)
+                    for auto_bridge_thread_channel in auto_thread_query_result
+                }
             )
             logger.info("Auto-thread-bridging channels loaded.")
     except Exception as e:
@@ -140,48 +156,12 @@ async def on_ready():
 
     # Finally I'll check whether I have a registered emoji server and save it if so
     logger.info("Loading emoji server...")
-    emoji_server_id_str = globals.settings.get("emoji_server_id")
-    try:
-        if emoji_server_id_str:
-            emoji_server_id = int(emoji_server_id_str)
-        else:
-            emoji_server_id = None
-    except Exception:
-        logger.warning(
-            "Emoji server ID stored in settings.json file does not resolve to a valid integer."
-        )
-        emoji_server_id = None
-
-    if emoji_server_id:
-        emoji_server = globals.client.get_guild(emoji_server_id)
-        if not emoji_server:
-            try:
-                emoji_server = await globals.client.fetch_guild(emoji_server_id)
-            except Exception:
-                emoji_server = None
-
-        if not emoji_server:
-            logger.warning(
-                "Couldn't find emoji server with ID registered in settings.json."
-            )
-        elif (
-            not emoji_server.me.guild_permissions.manage_expressions
-            or not emoji_server.me.guild_permissions.create_expressions
-        ):
-            logger.warning(
-                "I don't have Create Expressions and Manage Expressions permissions in the emoji server."
-            )
-        else:
-            globals.emoji_server = emoji_server
-
-        logger.info("Emoji server loaded.")
-    else:
-        logger.info("Emoji server ID not set.")
+    emoji_server = await globals.get_emoji_server()
 
     logger.info("Syncing command tree...")
     sync_command_tree = [globals.command_tree.sync()]
-    if globals.emoji_server:
-        sync_command_tree.append(globals.command_tree.sync(guild=globals.emoji_server))
+    if emoji_server:
+        sync_command_tree.append(globals.command_tree.sync(guild=emoji_server))
     await asyncio.gather(*sync_command_tree)
     logger.info("Command tree synced.")
 
@@ -201,7 +181,7 @@ async def on_ready():
         print("Bot is not connected to any servers.")
         logger.info("Bot is not connected to any servers.")
 
-    globals.is_ready = True
+    globals.ready_event.set()
     logger.info("Bot is ready.")
 
 
@@ -216,9 +196,9 @@ async def on_typing(
         - `user`: The user that is typing in the channel.
     """
     if not (
-        globals.is_ready
-        and globals.rate_limiter.has_capacity()
-        and isinstance(channel, (discord.TextChannel, discord.Thread))
+        globals.ready_event.is_set()
+        and (rate_limiter := globals.get_rate_limiter()).has_capacity()
+        and isinstance(channel, TextChannelOrThread)
         and globals.client.user
         and globals.client.user.id != user.id
     ):
@@ -235,7 +215,7 @@ async def on_typing(
         except Exception:
             pass
 
-    async with globals.rate_limiter:
+    async with rate_limiter:
         channels_typing: list[Coroutine[Any, Any, None]] = []
         for _, bridge in outbound_bridges.items():
             channels_typing.append(type_through_bridge(bridge))
@@ -255,11 +235,17 @@ async def on_message(message: discord.Message):
         - `Forbidden`: The authorization token for one of the webhooks is incorrect.
         - `ValueError`: The length of embeds was invalid, there was no token associated with one of the webhooks or ephemeral was passed with the improper webhook type or there was no state attached with one of the webhooks when giving it a view.
     """
+    if globals.ready_event.is_set() and not bridges.has_outbound_bridges(
+        message.channel.id
+    ):
+        # Most channels aren't bridged, so skip them before doing anything else
+        return
+
     lock = asyncio.Lock()
     async with lock:
         globals.message_lock[message.id] = lock
 
-        if not isinstance(message.channel, (discord.TextChannel, discord.Thread)):
+        if not isinstance(message.channel, TextChannelOrThread):
             return
 
         if message.type not in {discord.MessageType.default, discord.MessageType.reply}:
@@ -279,13 +265,7 @@ async def on_message(message: discord.Message):
                         )
                         or message.application_id not in local_whitelist
                     )
-                    and (
-                        not (
-                            global_whitelist := globals.settings.get("whitelisted_apps")
-                        )
-                        or message.application_id
-                        not in [int(app_id) for app_id in global_whitelist]
-                    )
+                    and message.application_id not in globals.whitelisted_apps
                 )
             )
         ):
@@ -331,7 +311,7 @@ async def bridge_message_helper(message: discord.Message):
 
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             if (
                 not message.message_snapshots
                 or len(message.message_snapshots) == 0
@@ -367,9 +347,7 @@ async def bridge_message_helper(message: discord.Message):
                     original_message_channel = await globals.get_channel_from_id(
                         message.reference.channel_id
                     )
-                    if isinstance(
-                        original_message_channel, (discord.TextChannel, discord.Thread)
-                    ):
+                    if isinstance(original_message_channel, TextChannelOrThread):
                         # I have access to the channel of the original message being forwarded
                         try:
                             # Try to find the original message
@@ -393,14 +371,7 @@ async def bridge_message_helper(message: discord.Message):
                 ):
                     original_message_channel_parent = original_message_channel.parent
                 forwarded_message_channel_is_nsfw = (
-                    isinstance(
-                        original_message_channel_parent,
-                        discord.TextChannel
-                        | discord.VoiceChannel
-                        | discord.StageChannel
-                        | discord.ForumChannel
-                        | discord.CategoryChannel,
-                    )
+                    isinstance(original_message_channel_parent, globals.GuildChannel)
                     and original_message_channel_parent.nsfw
                 )
 
@@ -439,34 +410,21 @@ async def bridge_message_helper(message: discord.Message):
                         x.id == replied_to_message.author.id for x in message.mentions
                     )
 
-                # First, check whether the message replied to was itself bridged from a different channel
-                replied_to_id = message.reference.message_id
-                select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                    DBMessageMap
-                ).where(DBMessageMap.target_message == str(replied_to_id))
-                local_replied_to_message_map: DBMessageMap | None = await sql_retry(
-                    lambda: session.scalars(select_message_map).first()
-                )
-                if isinstance(local_replied_to_message_map, DBMessageMap):
-                    # So the message replied to was bridged from elsewhere
-                    source_replied_to_id = int(
-                        local_replied_to_message_map.source_message
-                    )
-                    reply_source_channel_id = int(
-                        local_replied_to_message_map.source_channel
-                    )
-                    bridged_reply_to[reply_source_channel_id] = source_replied_to_id
-                else:
-                    source_replied_to_id = replied_to_id
-
-                # Now find all other bridged versions of the message we're replying to
-                select_bridged_reply_to: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                    DBMessageMap
-                ).where(DBMessageMap.source_message == str(source_replied_to_id))
-                query_result: ScalarResult[DBMessageMap] = await sql_retry(
-                    lambda: session.scalars(select_bridged_reply_to)
+                # Find the message replied to's source, if it was itself bridged from a different channel, and all other bridged versions of it in one go
+                replied_to_id_str = str(message.reference.message_id)
+                query_result: Sequence[DBMessageMap] = await sql_retry(
+                    lambda: session.scalars(
+                        select_message_maps_with_same_source,
+                        {"message_id": replied_to_id_str},
+                    ).all(),
+                    session=session,
                 )
                 for message_map in query_result:
+                    if message_map.target_message == replied_to_id_str:
+                        # So the message replied to was bridged from elsewhere
+                        bridged_reply_to[int(message_map.source_channel)] = int(
+                            message_map.source_message
+                        )
                     bridged_reply_to[int(message_map.target_channel)] = int(
                         message_map.target_message
                     )
@@ -490,6 +448,14 @@ async def bridge_message_helper(message: discord.Message):
             async_bridged_messages: list[Coroutine[Any, Any, BridgedMessage | None]] = (
                 []
             )
+            target_channels = await globals.get_channels_from_ids(
+                [
+                    target_id
+                    for target_id, webhook in reachable_channels.items()
+                    if webhook
+                ]
+            )
+            channel_member_ids: dict[int, set[int]] = {}
             for target_id, webhook in reachable_channels.items():
                 if not webhook:
                     continue
@@ -498,8 +464,8 @@ async def bridge_message_helper(message: discord.Message):
                 if not isinstance(webhook_channel, discord.TextChannel):
                     continue
 
-                target_channel = await globals.get_channel_from_id(target_id)
-                assert isinstance(target_channel, discord.TextChannel | discord.Thread)
+                target_channel = target_channels[target_id]
+                assert isinstance(target_channel, TextChannelOrThread)
 
                 thread_splat: ThreadSplat = {}
                 if target_id != webhook_channel.id:
@@ -532,12 +498,21 @@ async def bridge_message_helper(message: discord.Message):
                         forwarded_message,
                         forwarded_message_channel_is_nsfw,
                         thread_splat,
-                        session,
                     )
                 )
-                people_to_ping.difference_update(
-                    {member.id for member in webhook_channel.members}
-                )
+                if people_to_ping:
+                    # Threads share their parent channel's members, so work them out once per parent channel
+                    webhook_channel_member_ids = channel_member_ids.get(
+                        webhook_channel.id
+                    )
+                    if webhook_channel_member_ids is None:
+                        webhook_channel_member_ids = {
+                            member.id for member in webhook_channel.members
+                        }
+                        channel_member_ids[webhook_channel.id] = (
+                            webhook_channel_member_ids
+                        )
+                    people_to_ping.difference_update(webhook_channel_member_ids)
 
             if len(async_bridged_messages) == 0:
                 return
@@ -545,27 +520,46 @@ async def bridge_message_helper(message: discord.Message):
             # Insert references to the linked messages into the message_mappings table
             bridged_messages: list[BridgedMessage] = [
                 bridged_message
-                for bridged_message in (await asyncio.gather(*async_bridged_messages))
+                for bridged_message in await globals.gather_logging_errors(
+                    async_bridged_messages, "bridge a message"
+                )
                 if bridged_message
             ]
             source_message_id_str = str(message.id)
             source_channel_id_str = str(message_channel_id)
-            await sql_retry(
-                lambda: session.add_all(
-                    [
-                        DBMessageMap(
-                            source_message=source_message_id_str,
-                            source_channel=source_channel_id_str,
-                            target_message=bridged_message.id,
-                            target_channel=bridged_message.channel_id,
-                            forward_header_message=bridged_message.forwarded_header_id,
-                            webhook=bridged_message.webhook_id,
-                        )
-                        for bridged_message in bridged_messages
-                    ]
+            message_map_rows: list[dict[str, str | None]] = [
+                {
+                    "source_message": source_message_id_str,
+                    "source_channel": source_channel_id_str,
+                    "target_message": str(bridged_message.id),
+                    "target_channel": str(bridged_message.channel_id),
+                    "forward_header_message": (
+                        str(bridged_message.forwarded_header_id)
+                        if bridged_message.forwarded_header_id
+                        else None
+                    ),
+                    "webhook": (
+                        str(bridged_message.webhook_id)
+                        if bridged_message.webhook_id
+                        else None
+                    ),
+                }
+                for bridged_message in bridged_messages
+            ]
+            if len(message_map_rows) > 0:
+                # These rows aren't read back from the session, so insert them in bulk rather than through the unit of work
+                await sql_retry(
+                    lambda: session.execute(insert_message_maps, message_map_rows),
+                    session=session,
                 )
+            await sql_commit(session)
+            cache_message_maps(
+                source_message_id_str,
+                [
+                    DBMessageMap(**message_map_row)
+                    for message_map_row in message_map_rows
+                ],
             )
-            session.commit()
     except Exception as e:
         if session:
             session.rollback()
@@ -610,7 +604,6 @@ async def bridge_message_to_target_channel(
     forwarded_message: discord.Message | None,
     forwarded_message_channel_is_nsfw: bool,
     thread_splat: ThreadSplat,
-    session: SQLSession,
 ) -> BridgedMessage | None:
     """Bridge a message to a channel and returns the message bridged.
 
@@ -631,7 +624,6 @@ async def bridge_message_to_target_channel(
         - `forwarded_message`: A message being forwarded, in case it is a forward.
         - `forwarded_message_channel_is_nsfw`: Whether the origin channel of the message being forwarded from is NSFW.
         - `thread_splat`: A splat with the thread this message is being bridged to, if any.
-        - `session`: A connection to the database.
 
     #### Returns:
         - `discord.WebhookMessage`: The message bridged.
@@ -642,109 +634,155 @@ async def bridge_message_to_target_channel(
         target_channel.id,
     )
 
-    # Replace Discord links in the message and embed text
-    message_content = await replace_discord_links(
-        message_content, target_channel, session
-    )
-    for embed in message_embeds:
-        embed.description = await replace_discord_links(
-            embed.description,
-            target_channel,
-            session,
-        )
-        embed.title = await replace_discord_links(
-            embed.title,
-            target_channel,
-            session,
-        )
+    # Use a session of its own, since the other targets this message is being bridged to are processed concurrently
+    with session_factory() as session:
+        # Start fetching the message being replied to on this side of the bridge, if any, so it loads while the rest of the message is prepared
+        fetch_message_replied_to: asyncio.Task[discord.Message] | None = None
+        if message_is_reply and bridged_reply_to:
+            fetch_message_replied_to = asyncio.create_task(
+                target_channel.fetch_message(bridged_reply_to)
+            )
 
-    # Try to find whether the user who sent this message is on the other side of the bridge and if so what their name and avatar would be
-    bridged_member = await globals.get_channel_member(
-        webhook_channel, sent_message.author.id
-    )
-    if bridged_member:
-        bridged_member_name = bridged_member.display_name
-        bridged_avatar_url = bridged_member.display_avatar
-        bridged_member_id = bridged_member.id
-    else:
-        bridged_member_name = sent_message.author.display_name
-        bridged_avatar_url = sent_message.author.display_avatar
-        bridged_member_id = sent_message.author.id
-
-    if message_is_reply:
-        # This message is a reply to another message
-        def create_reply_embed_dict(
-            replied_to_author_avatar: discord.Asset | None,
-            replied_to_author_name: str | None,
-            replied_content: str | None,
-            *,
-            jump_url: str | None = None,
-            error_msg: str | None = None,
-        ) -> dict[str, str | dict[str, int | str]]:
-            reply_embed_dict: dict[str, str | dict[str, int | str]] = {"type": "rich"}
-
-            if replied_to_author_avatar and replied_to_author_name and replied_content:
-                reply_embed_dict["thumbnail"] = {
-                    "url": replied_to_author_avatar.replace(size=16).url,
-                    "height": 18,
-                    "width": 18,
+        try:
+            # Replace Discord links in the message and embed text
+            message_content = await replace_discord_links(
+                message_content, target_channel, session
+            )
+            for embed in message_embeds:
+                embed.description = await replace_discord_links(
+                    embed.description,
+                    target_channel,
+                    session,
+                )
+                embed.title = await replace_discord_links(
+                    embed.title,
+                    target_channel,
+                    session,
+                )
+
+            # Try to find whether the user who sent this message is on the other side of the bridge and if so what their name and avatar would be
+            bridged_member = await globals.get_channel_member(
+                webhook_channel, sent_message.author.id
+            )
+            if bridged_member:
+                bridged_member_name = bridged_member.display_name
+                bridged_avatar_url = bridged_member.display_avatar
+                bridged_member_id = bridged_member.id
+            else:
+                bridged_member_name = sent_message.author.display_name
+                bridged_avatar_url = sent_message.author.display_avatar
+                bridged_member_id = sent_message.author.id
+        except BaseException:
+            # Don't leave the fetch running in the background if preparing the message failed before it could be awaited
+            if fetch_message_replied_to:
+                fetch_message_replied_to.cancel()
+            raise
+
+        if message_is_reply:
+            # This message is a reply to another message
+            def create_reply_embed_dict(
+                replied_to_author_avatar: discord.Asset | None,
+                replied_to_author_name: str | None,
+                replied_content: str | None,
+                *,
+                jump_url: str | None = None,
+                error_msg: str | None = None,
+            ) -> dict[str, str | dict[str, int | str]]:
+                reply_embed_dict: dict[str, str | dict[str, int | str]] = {
+                    "type": "rich"
                 }
 
-                if jump_url:
+                if (
+                    replied_to_author_avatar
+                    and replied_to_author_name
+                    and replied_content
+                ):
+                    reply_embed_dict["thumbnail"] = {
+                        "url": replied_to_author_avatar.replace(size=16).url,
+                        "height": 18,
+                        "width": 18,
+                    }
+
+                    if jump_url:
+                        reply_embed_dict["url"] = jump_url
+                        reply_embed_dict["description"] = (
+                            f"**[↪]({jump_url}) {replied_to_author_name}**  {replied_content}"
+                        )
+                    elif error_msg:
+                        reply_embed_dict["description"] = (
+                            f"**↪ {replied_to_author_name}**  {replied_content}\n\n-# {error_msg}"
+                        )
+                elif jump_url:
                     reply_embed_dict["url"] = jump_url
                     reply_embed_dict["description"] = (
-                        f"**[↪]({jump_url}) {replied_to_author_name}**  {replied_content}"
+                        f"**[↪]({jump_url})**\n\n-# Couldn't load contents of the message this message is replying to."
                     )
-                elif error_msg:
+                else:
                     reply_embed_dict["description"] = (
-                        f"**↪ {replied_to_author_name}**  {replied_content}\n\n-# {error_msg}"
+                        "**↪\n\n-# This message is a reply but the message it's replying to could not be loaded."
                     )
-            elif jump_url:
-                reply_embed_dict["url"] = jump_url
-                reply_embed_dict["description"] = (
-                    f"**[↪]({jump_url})**\n\n-# Couldn't load contents of the message this message is replying to."
-                )
-            else:
-                reply_embed_dict["description"] = (
-                    "**↪\n\n-# This message is a reply but the message it's replying to could not be loaded."
-                )
-
-            return reply_embed_dict
 
-        if bridged_reply_to:
-            # The message being replied to is also bridged to this channel, so I'll create an embed to represent this
-            try:
-                message_replied_to = await target_channel.fetch_message(
-                    bridged_reply_to
-                )
+                return reply_embed_dict
 
-                # Use the author's display name if they're in this server
-                display_name = discord.utils.escape_markdown(
-                    message_replied_to.author.display_name
-                )
-                # Discord represents ping "ON" vs "OFF" replies with an @ symbol before the reply author name
-                # copy this behavior here
-                if reply_has_ping:
-                    display_name = "@" + display_name
+            if fetch_message_replied_to:
+                # The message being replied to is also bridged to this channel, so I'll create an embed to represent this
+                try:
+                    message_replied_to = await fetch_message_replied_to
 
-                if not replied_content:
-                    replied_content = await replace_missing_emoji(
-                        globals.truncate(
-                            discord.utils.remove_markdown(
-                                message_replied_to.clean_content
+                    # Use the author's display name if they're in this server
+                    display_name = discord.utils.escape_markdown(
+                        message_replied_to.author.display_name
+                    )
+                    # Discord represents ping "ON" vs "OFF" replies with an @ symbol before the reply author name
+                    # copy this behavior here
+                    if reply_has_ping:
+                        display_name = "@" + display_name
+
+                    if not replied_content:
+                        replied_content = await replace_missing_emoji(
+                            globals.truncate(
+                                discord.utils.remove_markdown(
+                                    message_replied_to.clean_content
+                                ),
+                                50,
                             ),
-                            50,
-                        ),
-                        session,
+                            session,
+                        )
+                    reply_embed_dict = create_reply_embed_dict(
+                        message_replied_to.author.display_avatar,
+                        display_name,
+                        replied_content,
+                        jump_url=message_replied_to.jump_url,
                     )
-                reply_embed_dict = create_reply_embed_dict(
-                    message_replied_to.author.display_avatar,
-                    display_name,
-                    replied_content,
-                    jump_url=message_replied_to.jump_url,
-                )
-                reply_embed = [discord.Embed.from_dict(reply_embed_dict)]
-            except discord.HTTPException:
+                    reply_embed = [discord.Embed.from_dict(reply_embed_dict)]
+                except discord.HTTPException:
+                    if replied_content and replied_author:
+                        replied_author_name = discord.utils.escape_markdown(
+                            replied_author.name
+                        )
+                        if reply_has_ping:
+                            replied_author_name = "@" + replied_author_name
+
+                        reply_embed = [
+                            discord.Embed.from_dict(
+                                create_reply_embed_dict(
+                                    replied_author.display_avatar,
+                                    replied_author_name,
+                                    replied_content,
+                                    error_msg="The message being replied to could not be loaded.",
+                                )
+                            )
+                        ]
+                    else:
+                        reply_embed = [
+                            discord.Embed.from_dict(
+                                {
+                                    "type": "rich",
+                                    "description": f"-# **↪** This message is a reply but the message being replied to could not be loaded.",
+                                }
+                            )
+                        ]
+            else:
                 if replied_content and replied_author:
                     replied_author_name = discord.utils.escape_markdown(
                         replied_author.name
@@ -758,7 +796,7 @@ async def bridge_message_to_target_channel(
                                 replied_author.display_avatar,
                                 replied_author_name,
                                 replied_content,
-                                error_msg="The message being replied to could not be loaded.",
+                                error_msg="The message being replied to has not been bridged or has been deleted.",
                             )
                         )
                     ]
@@ -772,116 +810,89 @@ async def bridge_message_to_target_channel(
                         )
                     ]
         else:
-            if replied_content and replied_author:
-                replied_author_name = discord.utils.escape_markdown(replied_author.name)
-                if reply_has_ping:
-                    replied_author_name = "@" + replied_author_name
-
-                reply_embed = [
-                    discord.Embed.from_dict(
-                        create_reply_embed_dict(
-                            replied_author.display_avatar,
-                            replied_author_name,
-                            replied_content,
-                            error_msg="The message being replied to has not been bridged or has been deleted.",
-                        )
-                    )
-                ]
-            else:
-                reply_embed = [
-                    discord.Embed.from_dict(
-                        {
-                            "type": "rich",
-                            "description": f"-# **↪** This message is a reply but the message being replied to could not be loaded.",
-                        }
-                    )
-                ]
-    else:
-        reply_embed = []
-
-    attachments = await asyncio.gather(
-        *[attachment.to_file() for attachment in message_attachments]
-    )
+            reply_embed = []
 
-    try:
-        if not forwarded_message:
-            # Message is not a forward
-            sent_message = await webhook.send(
-                content=message_content,
-                allowed_mentions=discord.AllowedMentions(
-                    users=[discord.Object(id=id) for id in people_to_ping],
-                    roles=False,
-                    everyone=False,
-                ),
-                avatar_url=bridged_avatar_url,
-                username=bridged_member_name,
-                embeds=list(message_embeds + reply_embed),
-                files=attachments,  # TODO might throw HHTPException if too large?
-                wait=True,
-                **thread_splat,
-            )
-            return BridgedMessage(
-                id=sent_message.id,
-                channel_id=sent_message.channel.id,
-                webhook_id=sent_message.webhook_id,
-                forwarded_header_id=None,
-            )
+        attachments = await asyncio.gather(
+            *[attachment.to_file() for attachment in message_attachments]
+        )
 
-        # Message is a forward so I'll send a short message saying who sent it then forward it myself
-        target_channel_parent = await globals.get_channel_parent(target_channel)
-        if not target_channel_parent.nsfw and forwarded_message_channel_is_nsfw:
-            # Messages can't be forwarded from NSFW channels to SFW channels
-            sent_message = await target_channel.send(
-                allowed_mentions=discord.AllowedMentions(
-                    users=False, roles=False, everyone=False
-                ),
-                content=f"> -# <@{bridged_member_id}> forwarded a message from an NSFW channel across the bridge but this channel is SFW; forwarding failed.",
-            )
+        try:
+            if not forwarded_message:
+                # Message is not a forward
+                sent_message = await webhook.send(
+                    content=message_content,
+                    allowed_mentions=(
+                        discord.AllowedMentions(
+                            users=[discord.Object(id=id) for id in people_to_ping],
+                            roles=False,
+                            everyone=False,
+                        )
+                        if people_to_ping
+                        else no_allowed_mentions
+                    ),
+                    avatar_url=bridged_avatar_url,
+                    username=bridged_member_name,
+                    embeds=list(message_embeds + reply_embed),
+                    files=attachments,  # TODO might throw HHTPException if too large?
+                    wait=True,
+                    **thread_splat,
+                )
+                return BridgedMessage(
+                    id=sent_message.id,
+                    channel_id=sent_message.channel.id,
+                    webhook_id=sent_message.webhook_id,
+                    forwarded_header_id=None,
+                )
 
-            return BridgedMessage(
-                id=sent_message.id,
-                channel_id=sent_message.channel.id,
-                webhook_id=sent_message.webhook_id,
-                forwarded_header_id=None,
-            )
+            # Message is a forward so I'll send a short message saying who sent it then forward it myself
+            target_channel_parent = await globals.get_channel_parent(target_channel)
+            if not target_channel_parent.nsfw and forwarded_message_channel_is_nsfw:
+                # Messages can't be forwarded from NSFW channels to SFW channels
+                sent_message = await target_channel.send(
+                    allowed_mentions=no_allowed_mentions,
+                    content=f"> -# <@{bridged_member_id}> forwarded a message from an NSFW channel across the bridge but this channel is SFW; forwarding failed.",
+                )
 
-        # Either the target channel is NSFW or the source isn't, so the forwarding can work fine
-        async def bridge_forwarded_message():
-            forward_header = await target_channel.send(
-                allowed_mentions=discord.AllowedMentions(
-                    users=False, roles=False, everyone=False
-                ),
-                content=f"> -# The following message was originally forwarded by <@{bridged_member_id}>.",
-            )
-            bridged_forward = await forwarded_message.forward(target_channel)
-            return BridgedMessage(
-                id=bridged_forward.id,
-                channel_id=bridged_forward.channel.id,
-                webhook_id=bridged_forward.webhook_id,
-                forwarded_header_id=forward_header.id,
-            )
+                return BridgedMessage(
+                    id=sent_message.id,
+                    channel_id=sent_message.channel.id,
+                    webhook_id=sent_message.webhook_id,
+                    forwarded_header_id=None,
+                )
 
-        return await bridge_forwarded_message()
-    except discord.NotFound:
-        # Webhook is gone, delete this bridge
-        logger.warning(
-            "Webhook in %s:%s (ID: %s) not found, demolishing bridges to this channel and its threads.",
-            target_channel.guild.name,
-            target_channel.name,
-            target_channel.id,
-        )
+            # Either the target channel is NSFW or the source isn't, so the forwarding can work fine
+            async def bridge_forwarded_message():
+                forward_header = await target_channel.send(
+                    allowed_mentions=no_allowed_mentions,
+                    content=f"> -# The following message was originally forwarded by <@{bridged_member_id}>.",
+                )
+                bridged_forward = await forwarded_message.forward(target_channel)
+                return BridgedMessage(
+                    id=bridged_forward.id,
+                    channel_id=bridged_forward.channel.id,
+                    webhook_id=bridged_forward.webhook_id,
+                    forwarded_header_id=forward_header.id,
+                )
 
-        try:
-            await bridges.demolish_bridges(
-                target_channel=target_channel, session=session
-            )
-        except Exception as e:
-            logger.error(
-                "Exception occurred when trying to demolish an invalid bridge after bridging a message: %s",
-                e,
+            return await bridge_forwarded_message()
+        except discord.NotFound:
+            # Webhook is gone, delete this bridge
+            logger.warning(
+                "Webhook in %s:%s (ID: %s) not found, demolishing bridges to this channel and its threads.",
+                target_channel.guild.name,
+                target_channel.name,
+                target_channel.id,
             )
-            raise
-        return None
+
+            try:
+                await bridges.demolish_bridges(target_channel=target_channel)
+            except Exception as e:
+                logger.error(
+                    "Exception occurred when trying to demolish an invalid bridge after bridging a message: %s",
+                    e,
+                )
+                raise
+            return None
 
 
 @globals.client.event
@@ -898,6 +909,12 @@ async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent):
         - `Forbidden`: Tried to edit a message that is not yours.
         - `ValueError`: The length of embeds was invalid, there was no token associated with a webhook or a webhook had no state.
     """
+    if globals.ready_event.is_set() and not bridges.has_outbound_bridges(
+        payload.channel_id
+    ):
+        # Most channels aren't bridged, so skip them before doing anything else
+        return
+
     lock = globals.message_lock.get(payload.message_id)
     if not lock:
         lock = globals.message_lock[payload.message_id] = asyncio.Lock()
@@ -954,27 +971,28 @@ async def edit_message_helper(
     # Find all messages matching this one
     try:
         async_message_edits: list[Coroutine[Any, Any, None]] = []
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             # Ensure that the message has emoji I have access to
             message_content = await replace_missing_emoji(message_content, session)
 
             # Find bridged message
-            select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                DBMessageMap
-            ).where(DBMessageMap.source_message == message_id)
-            bridged_messages: ScalarResult[DBMessageMap] = await sql_retry(
-                lambda: session.scalars(select_message_map)
+            bridged_messages = await get_message_maps_from_source(
+                session, str(message_id)
             )
 
+            # Skip messages bridged to channels I can no longer reach and look the rest of the channels up all at once
+            bridged_messages = [
+                message_row
+                for message_row in bridged_messages
+                if int(message_row.target_channel) in reachable_channels
+            ]
+            bridged_channels = await globals.get_channels_from_ids(
+                {int(message_row.target_channel) for message_row in bridged_messages}
+            )
             for message_row in bridged_messages:
                 target_channel_id = int(message_row.target_channel)
-                if target_channel_id not in reachable_channels:
-                    continue
-
-                bridged_channel = await globals.get_channel_from_id(target_channel_id)
-                if not isinstance(
-                    bridged_channel, (discord.TextChannel, discord.Thread)
-                ):
+                bridged_channel = bridged_channels[target_channel_id]
+                if not isinstance(bridged_channel, TextChannelOrThread):
                     continue
 
                 thread_splat: ThreadSplat = {}
@@ -983,15 +1001,45 @@ async def edit_message_helper(
                         continue
                     thread_splat = {"thread": bridged_channel}
 
+                if not message_row.webhook:
+                    continue
+
+                # Replace Discord links in the message and embed text now, while the session is still open
+                webhook_channel = (
+                    bridged_channel.parent
+                    if isinstance(bridged_channel, discord.Thread)
+                    else bridged_channel
+                )
+                channel_specific_message_content = message_content
+                channel_specific_embeds = deepcopy(embeds)
+                if isinstance(webhook_channel, discord.TextChannel):
+                    channel_specific_message_content = await replace_discord_links(
+                        channel_specific_message_content,
+                        webhook_channel,
+                        session,
+                    )
+                    for embed in channel_specific_embeds:
+                        embed.description = await replace_discord_links(
+                            embed.description,
+                            webhook_channel,
+                            session,
+                        )
+                        embed.title = await replace_discord_links(
+                            embed.title,
+                            webhook_channel,
+                            session,
+                        )
+
                 try:
 
                     async def edit_message(
                         message_row: DBMessageMap,
                         target_channel_id: int,
                         thread_splat: ThreadSplat,
+                        channel_specific_message_content: str,
+                        channel_specific_embeds: list[discord.Embed],
                     ):
-                        if not message_row.webhook:
-                            return
+                        assert message_row.webhook
 
                         # The webhook returned by the call to get_reachable_channels() may not be the same as the one used to post the message
                         message_webhook_id = int(message_row.webhook)
@@ -1009,30 +1057,6 @@ async def edit_message_helper(
                                 return
 
                         try:
-                            target_channel = webhook.channel
-                            channel_specific_message_content = message_content
-                            channel_specific_embeds = deepcopy(embeds)
-                            if isinstance(target_channel, discord.TextChannel):
-                                # Replace Discord links in the message and embed text
-                                channel_specific_message_content = (
-                                    await replace_discord_links(
-                                        channel_specific_message_content,
-                                        target_channel,
-                                        session,
-                                    )
-                                )
-                                for embed in channel_specific_embeds:
-                                    embed.description = await replace_discord_links(
-                                        embed.description,
-                                        target_channel,
-                                        session,
-                                    )
-                                    embed.title = await replace_discord_links(
-                                        embed.title,
-                                        target_channel,
-                                        session,
-                                    )
-
                             await webhook.edit_message(
                                 message_id=int(message_row.target_message),
                                 content=channel_specific_message_content,
@@ -1041,9 +1065,7 @@ async def edit_message_helper(
                             )
                         except discord.NotFound:
                             # Webhook is gone, delete this bridge
-                            assert isinstance(
-                                bridged_channel, (discord.TextChannel, discord.Thread)
-                            )
+                            assert isinstance(bridged_channel, TextChannelOrThread)
                             logger.warning(
                                 "Webhook in %s:%s (ID: %s) not found, demolishing bridges to this channel and its threads.",
                                 bridged_channel.guild.name,
@@ -1052,7 +1074,7 @@ async def edit_message_helper(
                             )
                             try:
                                 await bridges.demolish_bridges(
-                                    target_channel=bridged_channel, session=session
+                                    target_channel=bridged_channel
                                 )
                             except Exception as e:
                                 logger.error(
@@ -1065,6 +1087,8 @@ async def edit_message_helper(
                             message_row,
                             target_channel_id,
                             thread_splat,
+                            channel_specific_message_content,
+                            channel_specific_embeds,
                         )
                     )
                 except discord.HTTPException as e:
@@ -1072,8 +1096,6 @@ async def edit_message_helper(
                         "Ran into a Discord exception while trying to edit a message across a bridge:\n"
                         + str(e)
                     )
-
-            await asyncio.gather(*async_message_edits)
     except Exception as e:
         if isinstance(e, SQLError):
             logger.warning(
@@ -1086,6 +1108,9 @@ async def edit_message_helper(
 
         raise
 
+    # Every database lookup was done inside the session block, so its connection is back in the pool while the edits go out
+    await globals.gather_logging_errors(async_message_edits, "bridge a message edit")
+
     logger.debug("Successfully bridged edit to message with ID %s.", message_id)
 
 
@@ -1105,7 +1130,7 @@ async def replace_missing_emoji(
         - `RuntimeError`: Session connection failed.
         - `ServerTimeoutError`: Connection to server timed out.
     """
-    if not globals.emoji_server:
+    if not await globals.get_emoji_server():
         # If we don't have an emoji server to store our own versions of emoji in then there's nothing we can do
         return message_content
 
@@ -1117,7 +1142,7 @@ async def replace_missing_emoji(
         return message_content
 
     if not session:
-        session = SQLSession(engine)
+        session = session_factory()
         close_after = True
     else:
         close_after = False
@@ -1251,36 +1276,43 @@ async def replace_discord_links(
             continue
 
         # The message being linked is from a channel that is bridged to the current channel
-        select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-            DBMessageMap
-        ).where(
-            sql_or(
-                sql_and(
-                    DBMessageMap.source_message == link_message_id,
-                    DBMessageMap.target_channel.in_(channel_ids_to_check),
-                ),
-                sql_and(
-                    DBMessageMap.target_message == link_message_id,
-                    DBMessageMap.source_channel.in_(channel_ids_to_check),
-                ),
+        select_message_map: SQLSelect[tuple[str, str, str, str]] = (
+            SQLSelect(
+                DBMessageMap.source_message,
+                DBMessageMap.source_channel,
+                DBMessageMap.target_message,
+                DBMessageMap.target_channel,
             )
+            .where(
+                sql_or(
+                    sql_and(
+                        DBMessageMap.source_message == link_message_id,
+                        DBMessageMap.target_channel.in_(channel_ids_to_check),
+                    ),
+                    sql_and(
+                        DBMessageMap.target_message == link_message_id,
+                        DBMessageMap.source_channel.in_(channel_ids_to_check),
+                    ),
+                )
+            )
+            .limit(1)
         )
-        bridged_messages: ScalarResult[DBMessageMap] = await sql_retry(
-            lambda: session.scalars(select_message_map)
+        message_row = await sql_retry(
+            lambda: session.execute(select_message_map).first(), session=session
         )
-        for message_row in bridged_messages:
-            if message_row.source_message == link_message_id:
-                content = content.replace(
-                    f"{link_guild_id}/{link_channel_id}/{link_message_id}",
-                    f"{guild_id}/{message_row.target_channel}/{message_row.target_message}",
-                )
-            else:
-                content = content.replace(
-                    f"{link_guild_id}/{link_channel_id}/{link_message_id}",
-                    f"{guild_id}/{message_row.source_channel}/{message_row.source_message}",
-                )
+        if not message_row:
+            continue
 
-            break
+        if message_row.source_message == link_message_id:
+            content = content.replace(
+                f"{link_guild_id}/{link_channel_id}/{link_message_id}",
+                f"{guild_id}/{message_row.target_channel}/{message_row.target_message}",
+            )
+        else:
+            content = content.replace(
+                f"{link_guild_id}/{link_channel_id}/{link_message_id}",
+                f"{guild_id}/{message_row.source_channel}/{message_row.source_message}",
+            )
 
     return content
 
@@ -1297,6 +1329,12 @@ async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
         - `Forbidden`: Tried to delete a message that is not yours.
         - `ValueError`: A webhook does not have a token associated with it.
     """
+    if globals.ready_event.is_set() and not bridges.has_outbound_bridges(
+        payload.channel_id
+    ):
+        # Most channels aren't bridged, so skip them before doing anything else
+        return
+
     lock = globals.message_lock.get(payload.message_id)
     if not lock:
         lock = globals.message_lock[payload.message_id] = asyncio.Lock()
@@ -1336,128 +1374,109 @@ async def delete_message_helper(message_id: int, channel_id: int):
     )
 
     # Find all messages matching this one
-    session = None
+    message_id_str = str(message_id)
     try:
         async_message_deletes: list[Coroutine[Any, Any, None]] = []
-        with SQLSession(engine) as session:
-            select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                DBMessageMap
-            ).where(DBMessageMap.source_message == message_id)
-            bridged_messages: ScalarResult[DBMessageMap] = await sql_retry(
-                lambda: session.scalars(select_message_map)
-            )
-            for message_row in bridged_messages:
-                target_channel_id = int(message_row.target_channel)
-                if target_channel_id not in reachable_channels:
-                    continue
-
-                bridged_channel = await globals.get_channel_from_id(target_channel_id)
-                if not isinstance(
-                    bridged_channel, (discord.TextChannel, discord.Thread)
-                ):
+        # If the message was bridged, delete its row
+        # If it was a source of bridged messages, delete all rows of its bridged versions
+        bridged_messages = await pop_message_maps_from_source(message_id_str)
+
+        # Skip messages bridged to channels I can no longer reach and look the rest of the channels up all at once
+        bridged_messages = [
+            message_row
+            for message_row in bridged_messages
+            if int(message_row.target_channel) in reachable_channels
+        ]
+        bridged_channels = await globals.get_channels_from_ids(
+            {int(message_row.target_channel) for message_row in bridged_messages}
+        )
+        for message_row in bridged_messages:
+            target_channel_id = int(message_row.target_channel)
+            bridged_channel = bridged_channels[target_channel_id]
+            if not isinstance(bridged_channel, TextChannelOrThread):
+                continue
+
+            thread_splat: ThreadSplat = {}
+            if isinstance(bridged_channel, discord.Thread):
+                if not isinstance(bridged_channel.parent, discord.TextChannel):
                     continue
+                thread_splat = {"thread": bridged_channel}
 
-                thread_splat: ThreadSplat = {}
-                if isinstance(bridged_channel, discord.Thread):
-                    if not isinstance(bridged_channel.parent, discord.TextChannel):
-                        continue
-                    thread_splat = {"thread": bridged_channel}
-
-                try:
-
-                    async def delete_message(
-                        message_row: DBMessageMap,
-                        target_channel_id: int,
-                        thread_splat: ThreadSplat,
-                    ):
-                        if message_row.webhook:
-                            # The webhook returned by the call to get_reachable_channels() may not be the same as the one used to post the message
-                            message_webhook_id = int(message_row.webhook)
-                            if (
-                                message_webhook_id
-                                == reachable_channels[target_channel_id].id
-                            ):
-                                webhook = reachable_channels[target_channel_id]
-                            else:
-                                try:
-                                    webhook = await globals.client.fetch_webhook(
-                                        message_webhook_id
-                                    )
-                                except Exception:
-                                    return
+            try:
 
+                async def delete_message(
+                    message_row: DBMessageMap,
+                    target_channel_id: int,
+                    thread_splat: ThreadSplat,
+                ):
+                    if message_row.webhook:
+                        # The webhook returned by the call to get_reachable_channels() may not be the same as the one used to post the message
+                        message_webhook_id = int(message_row.webhook)
+                        if (
+                            message_webhook_id
+                            == reachable_channels[target_channel_id].id
+                        ):
+                            webhook = reachable_channels[target_channel_id]
+                        else:
                             try:
-                                await webhook.delete_message(
-                                    int(message_row.target_message),
-                                    **thread_splat,
-                                )
-                            except discord.NotFound:
-                                # Webhook is gone, delete this bridge
-                                assert isinstance(
-                                    bridged_channel,
-                                    (discord.TextChannel, discord.Thread),
+                                webhook = await globals.client.fetch_webhook(
+                                    message_webhook_id
                                 )
-                                logger.warning(
-                                    "Webhook in %s:%s (ID: %s) not found, demolishing bridges to this channel and its threads.",
-                                    bridged_channel.guild.name,
-                                    bridged_channel.name,
-                                    bridged_channel.id,
+                            except Exception:
+                                return
+
+                        try:
+                            await webhook.delete_message(
+                                int(message_row.target_message),
+                                **thread_splat,
+                            )
+                        except discord.NotFound:
+                            # Webhook is gone, delete this bridge
+                            assert isinstance(
+                                bridged_channel,
+                                (discord.TextChannel, discord.Thread),
+                            )
+                            logger.warning(
+                                "Webhook in %s:%s (ID: %s) not found, demolishing bridges to this channel and its threads.",
+                                bridged_channel.guild.name,
+                                bridged_channel.name,
+                                bridged_channel.id,
+                            )
+                            try:
+                                await bridges.demolish_bridges(
+                                    target_channel=bridged_channel
                                 )
-                                try:
-                                    await bridges.demolish_bridges(
-                                        target_channel=bridged_channel, session=session
+                            except Exception as e:
+                                if not isinstance(e, discord.HTTPException):
+                                    logger.error(
+                                        "Exception occurred when trying to demolish an invalid bridge after bridging a message deletion: %s",
+                                        e,
                                     )
-                                except Exception as e:
-                                    if not isinstance(e, discord.HTTPException):
-                                        logger.error(
-                                            "Exception occurred when trying to demolish an invalid bridge after bridging a message deletion: %s",
-                                            e,
-                                        )
-                                    raise
-                        elif message_row.forward_header_message:
-                            # If the message doesn't have a webhook, it's forwarded
-                            partial_target_channel = (
-                                globals.client.get_partial_messageable(
-                                    target_channel_id
-                                )
-                            )
-                            await partial_target_channel.get_partial_message(
-                                int(message_row.target_message)
-                            ).delete()
-                            await partial_target_channel.get_partial_message(
-                                int(message_row.forward_header_message)
-                            ).delete()
-                        else:
-                            # This should never happen
-                            return
-
-                    async_message_deletes.append(
-                        delete_message(message_row, target_channel_id, thread_splat)
-                    )
-                except discord.HTTPException as e:
-                    logger.warning(
-                        "Ran into a Discord exception while trying to delete a message across a bridge: %s",
-                        e,
-                    )
-
-            # If the message was bridged, delete its row
-            # If it was a source of bridged messages, delete all rows of its bridged versions
-            await sql_retry(
-                lambda: session.execute(
-                    SQLDelete(DBMessageMap).where(
-                        sql_or(
-                            DBMessageMap.source_message == str(message_id),
-                            DBMessageMap.target_message == str(message_id),
+                                raise
+                    elif message_row.forward_header_message:
+                        # If the message doesn't have a webhook, it's forwarded
+                        partial_target_channel = globals.client.get_partial_messageable(
+                            target_channel_id
                         )
-                    )
+                        await partial_target_channel.get_partial_message(
+                            int(message_row.target_message)
+                        ).delete()
+                        await partial_target_channel.get_partial_message(
+                            int(message_row.forward_header_message)
+                        ).delete()
+                    else:
+                        # This should never happen
+                        return
+
+                async_message_deletes.append(
+                    delete_message(message_row, target_channel_id, thread_splat)
+                )
+            except discord.HTTPException as e:
+                logger.warning(
+                    "Ran into a Discord exception while trying to delete a message across a bridge: %s",
+                    e,
                 )
-            )
-            session.commit()
     except Exception as e:
-        if session:
-            session.rollback()
-            session.close()
-
         if isinstance(e, SQLError):
             logger.warning(
                 "Ran into an SQL error while trying to delete a message: %s", e
@@ -1469,7 +1488,9 @@ async def delete_message_helper(message_id: int, channel_id: int):
 
         raise
 
-    await asyncio.gather(*async_message_deletes)
+    await globals.gather_logging_errors(
+        async_message_deletes, "bridge a message deletion"
+    )
 
     logger.debug("Successfully bridged deletion of message with ID %s.", message_id)
 
@@ -1632,16 +1653,30 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
                 target_emoji_name=bridged_emoji_name,
             )
 
-        with SQLSession(engine) as session:
+        # Find this message's source, if it was bridged, along with every message bridged from that source, trying the cache before the database
+        bridged_messages_query_result: Sequence[DBMessageMap] | None = (
+            get_cached_message_maps_with_same_source(source_message_id_str)
+        )
+        with session_factory() as session:
+            if bridged_messages_query_result is None:
+                bridged_messages_query_result = await sql_retry(
+                    lambda: session.scalars(
+                        select_message_maps_with_same_source,
+                        {"message_id": source_message_id_str},
+                    ).all(),
+                    session=session,
+                )
+            if len(bridged_messages_query_result) == 0:
+                # This message was never bridged in either direction, so there's nothing to react to
+                return
+
             # Let me check whether I've already reacted to bridged messages in some of these channels
-            select_reaction_map: SQLSelect[tuple[DBReactionMap]] = SQLSelect(
-                DBReactionMap
-            ).where(
-                DBReactionMap.source_message == source_message_id_str,
-                DBReactionMap.source_emoji == emoji_id_str,
-            )
-            already_bridged_reactions: ScalarResult[DBReactionMap] = await sql_retry(
-                lambda: session.scalars(select_reaction_map)
+            already_bridged_reactions: Sequence[DBReactionMap] = await sql_retry(
+                lambda: session.scalars(
+                    select_reaction_maps_by_source,
+                    {"message_id": source_message_id_str, "emoji_id": emoji_id_str},
+                ).all(),
+                session=session,
             )
             already_bridged_reaction_channels = {
                 int(bridged_reaction.target_channel)
@@ -1655,14 +1690,13 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
                 # I've already bridged this reaction to all reachable channels
                 return
 
-            # First, check whether this message is bridged, in which case I need to find its source
-            select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                DBMessageMap
-            ).where(
-                DBMessageMap.target_message == source_message_id_str,
-            )
-            source_message_map: DBMessageMap | None = await sql_retry(
-                lambda: session.scalars(select_message_map).first()
+            source_message_map = next(
+                (
+                    message_row
+                    for message_row in bridged_messages_query_result
+                    if message_row.target_message == source_message_id_str
+                ),
+                None,
             )
             if isinstance(source_message_map, DBMessageMap):
                 # This message was bridged, so find the original one, react to it, and then find any other bridged messages from it
@@ -1673,7 +1707,7 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
                     # The source channel isn't valid or reachable anymore, so we can't find the other versions of this message
                     return
 
-                assert isinstance(source_channel, (discord.TextChannel, discord.Thread))
+                assert isinstance(source_channel, TextChannelOrThread)
 
                 source_channel_id = source_channel.id
                 source_message_id = int(source_message_map.source_message)
@@ -1701,25 +1735,18 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
             if not bridges.get_outbound_bridges(source_channel_id):
                 if len(async_add_reactions) > 0:
                     reaction_added = await async_add_reactions[0]
-                    await sql_retry(lambda: session.add(reaction_added))
-                    session.commit()
+                    # Adding to the session doesn't touch the database until it's committed
+                    session.add(reaction_added)
+                    await sql_commit(session)
                 return
 
-            select_message_map: SQLSelect[tuple[DBMessageMap]] = SQLSelect(
-                DBMessageMap
-            ).where(DBMessageMap.source_message == str(source_message_id))
-            bridged_messages_query_result: ScalarResult[DBMessageMap] = await sql_retry(
-                lambda: session.scalars(select_message_map)
-            )
             for message_row in bridged_messages_query_result:
                 target_channel_id = int(message_row.target_channel)
                 if target_channel_id not in reachable_channel_ids:
                     continue
 
                 bridged_channel = await globals.get_channel_from_id(target_channel_id)
-                if not isinstance(
-                    bridged_channel, (discord.TextChannel, discord.Thread)
-                ):
+                if not isinstance(bridged_channel, TextChannelOrThread):
                     continue
 
                 try:
@@ -1740,9 +1767,11 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
                     )
                     raise
 
-        reactions_added = await asyncio.gather(*async_add_reactions)
-        await sql_retry(lambda: session.add_all([r for r in reactions_added if r]))
-        session.commit()
+        reactions_added = await globals.gather_logging_errors(
+            async_add_reactions, "bridge a reaction"
+        )
+        session.add_all([r for r in reactions_added if r])
+        await sql_commit(session)
     except Exception as e:
         if session:
             session.rollback()
@@ -1787,7 +1816,7 @@ async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
         return
 
     channel = await globals.get_channel_from_id(payload.channel_id)
-    if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+    if not isinstance(channel, TextChannelOrThread):
         # This really shouldn't happen
         return
 
@@ -1903,7 +1932,7 @@ async def unreact(
 
     session = None
     try:
-        with SQLSession(engine) as session:
+        with session_factory() as session:
             # First I find all of the messages that got this reaction bridged to them
             conditions = [DBReactionMap.source_message == str(payload.message_id)]
             if removed_emoji_id:
@@ -1912,8 +1941,8 @@ async def unreact(
             select_bridged_reactions: SQLSelect[tuple[DBReactionMap]] = SQLSelect(
                 DBReactionMap
             ).where(*conditions)
-            bridged_reactions: ScalarResult[DBReactionMap] = await sql_retry(
-                lambda: session.scalars(select_bridged_reactions)
+            bridged_reactions: Sequence[DBReactionMap] = await sql_retry(
+                lambda: session.scalars(select_bridged_reactions).all(), session=session
             )
             bridged_messages = {
                 (
@@ -1934,7 +1963,8 @@ async def unreact(
 
             # Then I remove them from the database
             await sql_retry(
-                lambda: session.execute(SQLDelete(DBReactionMap).where(*conditions))
+                lambda: session.execute(SQLDelete(DBReactionMap).where(*conditions)),
+                session=session,
             )
 
             # Next I find the messages that still have reactions of this type in them even after I removed the ones above
@@ -1948,8 +1978,8 @@ async def unreact(
             select_bridged_reactions: SQLSelect[tuple[DBReactionMap]] = SQLSelect(
                 DBReactionMap
             ).where(*conditions)
-            remaining_reactions: ScalarResult[DBReactionMap] = await sql_retry(
-                lambda: session.scalars(select_bridged_reactions)
+            remaining_reactions: Sequence[DBReactionMap] = await sql_retry(
+                lambda: session.scalars(select_bridged_reactions).all(), session=session
             )
 
             # And I get rid of my reactions from the messages that aren't on that list
@@ -1967,7 +1997,7 @@ async def unreact(
                 for map in remaining_reactions
             }
 
-            session.commit()
+            await sql_commit(session)
 
             if len(messages_to_remove_reaction_from) == 0:
                 # I don't have to remove my reaction from any bridged messages
@@ -2000,9 +2030,7 @@ async def unreact(
                 target_channel = await globals.get_channel_from_id(
                     int(target_channel_id)
                 )
-                if not isinstance(
-                    target_channel, (discord.TextChannel, discord.Thread)
-                ):
+                if not isinstance(target_channel, TextChannelOrThread):
                     return
 
                 target_message = await target_channel.fetch_message(
@@ -2027,8 +2055,8 @@ async def unreact(
                 )
                 for target_message_id, target_channel_id, target_emoji_id, target_emoji_name, _ in messages_to_remove_reaction_from
             }
-            await asyncio.gather(
-                *[
+            await globals.gather_logging_errors(
+                [
                     remove_reactions_with_emoji(
                         target_channel_id,
                         target_message_id,
@@ -2036,7 +2064,8 @@ async def unreact(
                         target_emoji_name,
                     )
                     for target_message_id, target_channel_id, target_emoji_id, target_emoji_name in compacted_messages_to_remove_reaction_from
-                ]
+                ],
+                "remove a bridged reaction",
             )
     except Exception as e:
         if session:
@@ -2131,7 +2160,76 @@ async def on_guild_remove(server: discord.Guild):
     print(left_server_msg)
 
 
-app_token = globals.settings.get("app_token")
-assert isinstance(app_token, str)
+@globals.client.event
+async def on_guild_channel_update(
+    before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+):
+    """Forget the recently fetched version of a channel that was updated, so that its next lookup sees the update.
+
+    This function is called whenever a server channel is updated, such as when it's renamed or its permissions change.
+
+    #### Args:
+        - `before`: The channel before the update.
+        - `after`: The channel after the update.
+    """
+    globals.invalidate_channel(after.id)
+
+
+@globals.client.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    """Forget the recently fetched version of a channel that was deleted.
+
+    This function is called whenever a server channel is deleted.
+
+    #### Args:
+        - `channel`: The channel that was deleted.
+    """
+    globals.invalidate_channel(channel.id)
+
+
+@globals.client.event
+async def on_raw_thread_delete(payload: discord.RawThreadDeleteEvent):
+    """Forget the recently fetched version of a thread that was deleted.
+
+    This function is called whenever a thread is deleted. Unlike `on_thread_delete()`, this is called regardless of the thread being in the internal thread cache or not.
+
+    #### Args:
+        - `payload`: The raw event payload data.
+    """
+    globals.invalidate_channel(payload.thread_id)
+
+
+@globals.client.event
+async def on_member_join(member: discord.Member):
+    """Forget any recent lookup of a member who just joined a server, so that they can be found there from now on.
+
+    This function is called when a member joins a server. Requires Intents.members to be enabled.
+
+    #### Args:
+        - `member`: The member who joined.
+    """
+    globals.invalidate_member(member.guild.id, member.id)
+
+
+@globals.client.event
+async def on_raw_member_remove(payload: discord.RawMemberRemoveEvent):
+    """Forget the recently fetched version of a member who left a server.
+
+    This function is called when a member leaves a server. Unlike `on_member_remove()`, this is called regardless of the member being in the internal member cache or not. Requires Intents.members to be enabled.
+
+    #### Args:
+        - `payload`: The raw event payload data.
+    """
+    globals.invalidate_member(payload.guild_id, payload.user.id)
+
+
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop.")
+except ImportError:
+    pass
+
 logger.info("Connecting client...")
-globals.client.run(app_token, reconnect=True)
+globals.client.run(globals.app_token, reconnect=True)
@@ -15,6 +15,9 @@ logging.basicConfig(
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Channel types a message can be bridged from or to, as a tuple so isinstance() checks stay cheap
+TextChannelOrThread = (discord.TextChannel, discord.Thread)
+
 
 class ChannelTypeError(ValueError):
     pass
@@ -47,6 +50,14 @@ def validate_channels(
     """
     cast_channels: dict[str, discord.TextChannel | discord.Thread] = {}
     for channel_name, channel in kwargs.items():
+        channel_type = type(channel)
+        if channel_type is discord.TextChannel or (
+            channel_type is discord.Thread
+            and type(channel.parent) is discord.TextChannel
+        ):
+            cast_channels[channel_name] = channel
+            continue
+
         if (
             not isinstance(channel, discord.Thread)
             or not isinstance(channel.parent, discord.TextChannel)